@@ -3,76 +3,136 @@ Configuration management for the trading bot
 """
 
 import os
-import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+# Live view of the environment; the typed readers below cache the first value they see
+_ENV = os.environ
+_get = _ENV.get
+
+
+@lru_cache(maxsize=None)
+def _get_int(name: str, default: str) -> int:
+    """Read an integer environment variable"""
+    return int(_get(name, default))
+
+
+@lru_cache(maxsize=None)
+def _get_float(name: str, default: str) -> float:
+    """Read a float environment variable"""
+    return float(_get(name, default))
+
+
+@lru_cache(maxsize=None)
+def _get_bool(name: str, default: str) -> bool:
+    """Read a 'true'/'false' environment variable"""
+    return _get(name, default).lower() == 'true'
+
+
+def _get_list(name: str, default: str) -> list:
+    """Read a comma-separated environment variable"""
+    return _get(name, default).split(',')
+
+
+@dataclass(slots=True, frozen=True)
+class TradingHours:
+    """Trading window in market-local hours"""
+    start: int
+    end: int
+
+
+@dataclass(slots=True, frozen=True)
+class TradingConfig:
+    """Trading parameters"""
+    paper_trading: bool
+    max_position_size: float
+    risk_percentage: float
+    stop_loss_percentage: float
+    take_profit_percentage: float
+    symbols_to_trade: Tuple[str, ...]
+    max_stocks_to_trade: int
+    use_ai_stock_selection: bool
+    stock_selection_interval: int
+    trading_hours: TradingHours
+
+
+@dataclass(slots=True, frozen=True)
+class TechnicalConfig:
+    """Technical analysis thresholds"""
+    rsi_oversold: int = 30
+    rsi_overbought: int = 70
+    ma_period_short: int = 20
+    ma_period_long: int = 50
+    momentum_threshold: float = 2.0
+    volume_threshold: float = 1.5
+    stop_loss_percent: float = 5.0
+    take_profit_percent: float = 10.0
+
 
 class Config:
     """Configuration class with environment variable support"""
     
     # Flask configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-this')
+    SECRET_KEY = _get('SECRET_KEY', 'your-secret-key-change-this')
     
     # API Keys - Retrieved from environment variables
-    ALPACA_API_KEY = os.getenv('ALPACA_API_KEY', '')
-    ALPACA_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY', '')
+    ALPACA_API_KEY = _get('ALPACA_API_KEY', '')
+    ALPACA_SECRET_KEY = _get('ALPACA_SECRET_KEY', '')
 
-    TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
-    TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '')
-    ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY', '')
+    TELEGRAM_BOT_TOKEN = _get('TELEGRAM_BOT_TOKEN', '')
+    TELEGRAM_CHAT_ID = _get('TELEGRAM_CHAT_ID', '')
+    ALPHA_VANTAGE_API_KEY = _get('ALPHA_VANTAGE_API_KEY', '')
     
     # Email configuration
-    SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-    SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
-    EMAIL_USERNAME = os.getenv('EMAIL_USERNAME', '')
-    EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
-    EMAIL_RECIPIENTS = os.getenv('EMAIL_RECIPIENTS', '').split(',')
+    SMTP_SERVER = _get('SMTP_SERVER', 'smtp.gmail.com')
+    SMTP_PORT = _get_int('SMTP_PORT', '587')
+    EMAIL_USERNAME = _get('EMAIL_USERNAME', '')
+    EMAIL_PASSWORD = _get('EMAIL_PASSWORD', '')
+    EMAIL_RECIPIENTS = _get_list('EMAIL_RECIPIENTS', '')
     
     # Alpaca configuration
-    ALPACA_BASE_URL = os.getenv('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets')  # Paper trading by default
-    ALPACA_DATA_URL = os.getenv('ALPACA_DATA_URL', 'https://data.alpaca.markets')
+    ALPACA_BASE_URL = _get('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets')  # Paper trading by default
+    ALPACA_DATA_URL = _get('ALPACA_DATA_URL', 'https://data.alpaca.markets')
+    
+    # Optional shared cache for market data (e.g. redis://localhost:6379/0); empty disables it
+    REDIS_URL = _get('REDIS_URL', '')
     
     # Trading parameters
-    TRADING_CONFIG = {
-        'paper_trading': os.getenv('PAPER_TRADING', 'true').lower() == 'true',
-        'max_position_size': float(os.getenv('MAX_POSITION_SIZE', '1000.0')),
-        'risk_percentage': float(os.getenv('RISK_PERCENTAGE', '2.0')),
-        'stop_loss_percentage': float(os.getenv('STOP_LOSS_PERCENTAGE', '5.0')),
-        'take_profit_percentage': float(os.getenv('TAKE_PROFIT_PERCENTAGE', '10.0')),
-        'symbols_to_trade': os.getenv('SYMBOLS_TO_TRADE', 'AAPL,MSFT,GOOGL,TSLA,AMZN').split(','),
-        'max_stocks_to_trade': int(os.getenv('MAX_STOCKS_TO_TRADE', '5')),
-        'use_ai_stock_selection': os.getenv('USE_AI_STOCK_SELECTION', 'true').lower() == 'true',
-        'stock_selection_interval': int(os.getenv('STOCK_SELECTION_INTERVAL', '30')),  # minutes
-        'trading_hours': {
-            'start': os.getenv('TRADING_START_HOUR', '9'),
-            'end': os.getenv('TRADING_END_HOUR', '16')
-        }
-    }
+    TRADING = TradingConfig(
+        paper_trading=_get_bool('PAPER_TRADING', 'true'),
+        max_position_size=_get_float('MAX_POSITION_SIZE', '1000.0'),
+        risk_percentage=_get_float('RISK_PERCENTAGE', '2.0'),
+        stop_loss_percentage=_get_float('STOP_LOSS_PERCENTAGE', '5.0'),
+        take_profit_percentage=_get_float('TAKE_PROFIT_PERCENTAGE', '10.0'),
+        symbols_to_trade=tuple(_get_list('SYMBOLS_TO_TRADE', 'AAPL,MSFT,GOOGL,TSLA,AMZN')),
+        max_stocks_to_trade=_get_int('MAX_STOCKS_TO_TRADE', '5'),
+        use_ai_stock_selection=_get_bool('USE_AI_STOCK_SELECTION', 'true'),
+        stock_selection_interval=_get_int('STOCK_SELECTION_INTERVAL', '30'),  # minutes
+        trading_hours=TradingHours(
+            start=_get_int('TRADING_START_HOUR', '9'),
+            end=_get_int('TRADING_END_HOUR', '16')
+        )
+    )
     
     # Technical Analysis configuration
-    TECHNICAL_CONFIG = {
-        'rsi_oversold': 30,
-        'rsi_overbought': 70,
-        'ma_period_short': 20,
-        'ma_period_long': 50,
-        'momentum_threshold': 2.0,
-        'volume_threshold': 1.5,
-        'stop_loss_percent': 5.0,
-        'take_profit_percent': 10.0
-    }
+    TECHNICAL = TechnicalConfig()
+    
+    # Settings that must be present before trading starts
+    REQUIRED_VARS = ('ALPACA_API_KEY', 'ALPACA_SECRET_KEY')
     
     @classmethod
     def validate_config(cls):
         """Validate that required configuration is present"""
-        required_vars = [
-            'ALPACA_API_KEY',
-            'ALPACA_SECRET_KEY'
-        ]
-        
-        missing_vars = []
-        for var in required_vars:
-            if not getattr(cls, var):
-                missing_vars.append(var)
+        missing_vars = [var for var in cls.REQUIRED_VARS if not getattr(cls, var)]
         
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
         
         return True
+
+
+@lru_cache(maxsize=None)
+def get_config() -> Config:
+    """Return the process-wide Config instance shared by all nodes"""
+    return Config()
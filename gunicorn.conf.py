@@ -0,0 +1,15 @@
+"""
+Gunicorn configuration for the trading bot
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# A single worker: the workflow engine keeps trading state in process memory,
+# so extra processes would each run their own trading loop. Threads handle
+# concurrent webhook/API requests instead.
+workers = 1
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = 120
@@ -6,32 +6,77 @@ Main application entry point
 import os
 import logging
 from flask import Flask, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime, timedelta
 import threading
 import time
+import sched
+
+import orjson
 
-from workflow_engine import WorkflowEngine
 from utils.logger import setup_logger
-from utils.scheduler import TaskScheduler
 from config import Config
 
 # Setup logging
 logger = setup_logger()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's key order and date format"""
+    
+    _options = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self._options).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get("SESSION_SECRET", "your-secret-key-change-this")
 app.config.from_object(Config)
 
-# Initialize workflow engine
-workflow_engine = WorkflowEngine()
-scheduler = TaskScheduler()
+# Workflow engine and task scheduler are created on first use, since
+# importing them pulls in every node module
+_workflow_engine = None
+_task_scheduler = None
+_init_lock = threading.Lock()
+
+def get_engine():
+    """Return the shared workflow engine, creating it on first use"""
+    global _workflow_engine
+    if _workflow_engine is None:
+        with _init_lock:
+            if _workflow_engine is None:
+                from workflow_engine import WorkflowEngine
+                _workflow_engine = WorkflowEngine()
+    return _workflow_engine
+
+def get_scheduler():
+    """Return the shared task scheduler, creating it on first use"""
+    global _task_scheduler
+    if _task_scheduler is None:
+        # Resolve the engine before taking the lock; get_engine takes it too
+        engine = get_engine()
+        with _init_lock:
+            if _task_scheduler is None:
+                from utils.scheduler import TaskScheduler
+                _task_scheduler = TaskScheduler(
+                    report_generator=engine.report_generator_node,
+                    email_node=engine.email_node,
+                    telegram_node=engine.telegram_node
+                )
+    return _task_scheduler
 
 @app.route('/')
 def dashboard():
     """Dashboard view"""
     try:
         # Get recent trades and performance metrics
+        workflow_engine = get_engine()
         recent_trades = workflow_engine.get_recent_trades()
         performance = workflow_engine.get_performance_metrics()
         
@@ -39,7 +84,7 @@ def dashboard():
                              trades=recent_trades, 
                              performance=performance)
     except Exception as e:
-        logger.error(f"Dashboard error: {str(e)}")
+        logger.error("Dashboard error: %s", e)
         return render_template('dashboard.html', 
                              trades=[], 
                              performance={})
@@ -49,7 +94,7 @@ def webhook_signal():
     """Webhook endpoint for receiving external trading signals"""
     try:
         data = request.get_json()
-        logger.info(f"Received webhook signal: {data}")
+        logger.info("Received webhook signal: %s", data)
         
         # Validate required fields
         required_fields = ['symbol', 'action', 'confidence']
@@ -57,32 +102,32 @@ def webhook_signal():
             return jsonify({'error': 'Missing required fields'}), 400
         
         # Process the signal through workflow engine
-        result = workflow_engine.process_external_signal(data)
+        result = get_engine().process_external_signal(data)
         
         return jsonify({'status': 'success', 'result': result})
         
     except Exception as e:
-        logger.error(f"Webhook error: {str(e)}")
+        logger.error("Webhook error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/start_trading', methods=['POST'])
 def start_trading():
     """Start the trading workflow"""
     try:
-        workflow_engine.start_trading()
+        get_engine().start_trading()
         return jsonify({'status': 'Trading started'})
     except Exception as e:
-        logger.error(f"Start trading error: {str(e)}")
+        logger.error("Start trading error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/stop_trading', methods=['POST'])
 def stop_trading():
     """Stop the trading workflow"""
     try:
-        workflow_engine.stop_trading()
+        get_engine().stop_trading()
         return jsonify({'status': 'Trading stopped'})
     except Exception as e:
-        logger.error(f"Stop trading error: {str(e)}")
+        logger.error("Stop trading error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -91,20 +136,20 @@ def stop_trading():
 def get_status():
     """Get current trading status"""
     try:
-        status = workflow_engine.get_status()
+        status = get_engine().get_status()
         return jsonify(status)
     except Exception as e:
-        logger.error(f"Status error: {str(e)}")
+        logger.error("Status error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/stock_selection')
 def get_stock_selection():
     """Get current stock selection info"""
     try:
-        selection_info = workflow_engine.get_current_stock_selection()
+        selection_info = get_engine().get_current_stock_selection()
         return jsonify(selection_info)
     except Exception as e:
-        logger.error(f"Stock selection error: {str(e)}")
+        logger.error("Stock selection error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/test_connection')
@@ -112,7 +157,7 @@ def test_connection():
     """Test Alpaca API connection"""
     try:
         # Test the Alpaca connection through the workflow engine
-        alpaca_node = workflow_engine.alpaca_node
+        alpaca_node = get_engine().alpaca_node
         account_info = alpaca_node.get_account_info()
         
         if account_info:
@@ -128,7 +173,7 @@ def test_connection():
             }), 500
             
     except Exception as e:
-        logger.error(f"Connection test error: {str(e)}")
+        logger.error("Connection test error: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Connection test failed: {str(e)}'
@@ -138,6 +183,7 @@ def test_connection():
 def update_stock_selection():
     """Manually trigger stock selection update"""
     try:
+        workflow_engine = get_engine()
         workflow_engine._update_selected_stocks()
         selection_info = workflow_engine.get_current_stock_selection()
         return jsonify({
@@ -145,14 +191,14 @@ def update_stock_selection():
             'selection_info': selection_info
         })
     except Exception as e:
-        logger.error(f"Manual stock selection update error: {str(e)}")
+        logger.error("Manual stock selection update error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/test_telegram', methods=['POST'])
 def test_telegram():
     """Test Telegram bot connectivity"""
     try:
-        telegram_node = workflow_engine.telegram_node
+        telegram_node = get_engine().telegram_node
         success = telegram_node.send_message("🤖 Telegram Bot Test: Connection successful! Your trading bot notifications are now active.")
         
         if success:
@@ -167,7 +213,7 @@ def test_telegram():
             }), 500
             
     except Exception as e:
-        logger.error(f"Telegram test error: {str(e)}")
+        logger.error("Telegram test error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/test_trade', methods=['POST'])
@@ -175,7 +221,7 @@ def test_trade():
     """Test trade execution with one of the selected stocks"""
     try:
         # Get current selected stocks
-        selection_info = workflow_engine.get_current_stock_selection()
+        selection_info = get_engine().get_current_stock_selection()
         selected_stocks = selection_info.get('selected_stocks', [])
         
         if not selected_stocks:
@@ -193,7 +239,7 @@ def test_trade():
         }
         
         # Process the test signal
-        result = workflow_engine.process_external_signal(test_signal)
+        result = get_engine().process_external_signal(test_signal)
         
         return jsonify({
             'status': 'Test trade executed',
@@ -202,41 +248,91 @@ def test_trade():
         })
         
     except Exception as e:
-        logger.error(f"Test trade error: {str(e)}")
+        logger.error("Test trade error: %s", e)
         return jsonify({'error': str(e)}), 500
 
+# Seconds between trading cycles
+TRADING_CYCLE_INTERVAL = 300
+
+def _next_weekly_report_time(now: datetime) -> datetime:
+    """Next Sunday at 9 AM"""
+    run_at = now.replace(hour=9, minute=0, second=0, microsecond=0)
+    run_at += timedelta(days=(6 - now.weekday()) % 7)
+    if run_at <= now:
+        run_at += timedelta(days=7)
+    return run_at
+
+def _next_monthly_report_time(now: datetime) -> datetime:
+    """Next 1st of the month at 10 AM"""
+    run_at = now.replace(day=1, hour=10, minute=0, second=0, microsecond=0)
+    if run_at <= now:
+        if run_at.month == 12:
+            run_at = run_at.replace(year=run_at.year + 1, month=1)
+        else:
+            run_at = run_at.replace(month=run_at.month + 1)
+    return run_at
+
 def run_scheduled_tasks():
     """Background thread for scheduled tasks"""
-    while True:
+    task_queue = sched.scheduler(time.time, time.sleep)
+    
+    def trading_cycle(scheduled_at: float):
+        # Schedule on a fixed grid; skip slots missed by a slow cycle
+        next_at = scheduled_at + TRADING_CYCLE_INTERVAL
+        while next_at <= time.time():
+            next_at += TRADING_CYCLE_INTERVAL
+        task_queue.enterabs(next_at, 1, trading_cycle, (next_at,))
+        
         try:
-            # Check for weekly reports (Sundays at 9 AM)
-            if datetime.now().weekday() == 6 and datetime.now().hour == 9:
-                scheduler.run_weekly_report()
-            
-            # Check for monthly reports (1st of month at 10 AM)
-            if datetime.now().day == 1 and datetime.now().hour == 10:
-                scheduler.run_monthly_report()
-            
-            # Run main trading loop every 5 minutes
-            workflow_engine.run_trading_cycle()
-            
-            time.sleep(300)  # 5 minutes
-            
+            get_engine().run_trading_cycle()
+        except Exception as e:
+            logger.error("Scheduled task error: %s", e)
+    
+    def weekly_report():
+        task_queue.enterabs(_next_weekly_report_time(datetime.now()).timestamp(), 0, weekly_report)
+        try:
+            get_scheduler().run_weekly_report()
+        except Exception as e:
+            logger.error("Scheduled task error: %s", e)
+    
+    def monthly_report():
+        task_queue.enterabs(_next_monthly_report_time(datetime.now()).timestamp(), 0, monthly_report)
+        try:
+            get_scheduler().run_monthly_report()
         except Exception as e:
-            logger.error(f"Scheduled task error: {str(e)}")
-            time.sleep(60)  # Wait 1 minute on error
+            logger.error("Scheduled task error: %s", e)
+    
+    now = datetime.now()
+    # Weekly reports (Sundays at 9 AM)
+    task_queue.enterabs(_next_weekly_report_time(now).timestamp(), 0, weekly_report)
+    # Monthly reports (1st of month at 10 AM)
+    task_queue.enterabs(_next_monthly_report_time(now).timestamp(), 0, monthly_report)
+    # Main trading loop every 5 minutes, starting now
+    start = time.time()
+    task_queue.enterabs(start, 1, trading_cycle, (start,))
+    
+    # Sleeps until the next due task instead of polling
+    task_queue.run()
+
+_scheduler_thread = None
+
+def start_background_tasks():
+    """Start the background scheduler thread once per process"""
+    global _scheduler_thread
+    if _scheduler_thread is None:
+        _scheduler_thread = threading.Thread(target=run_scheduled_tasks, daemon=True)
+        _scheduler_thread.start()
 
 if __name__ == '__main__':
     try:
         logger.info("Starting AI Trading Bot...")
         
         # Start background scheduler thread
-        scheduler_thread = threading.Thread(target=run_scheduled_tasks, daemon=True)
-        scheduler_thread.start()
+        start_background_tasks()
         
-        # Run Flask app
-        app.run(host='0.0.0.0', port=5000, debug=False)
+        # Development server only; production runs under gunicorn (see wsgi.py)
+        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
         
     except Exception as e:
-        logger.error(f"Application startup error: {str(e)}")
+        logger.error("Application startup error: %s", e)
         raise
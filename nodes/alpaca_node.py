@@ -3,91 +3,164 @@ Alpaca Node - Handles all Alpaca API trading operations
 """
 
 import logging
-import requests
+import httpx
+import orjson
 from typing import Dict, Optional, List
 from datetime import datetime
-import json
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
+import time
 
 from config import Config
 from utils.logger import setup_logger
+from utils.rate_limiter import ALPACA_LIMITER
 
 logger = setup_logger()
 
+# Order payloads are JSON; GETs carry no body and need no Content-Type
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Status codes Alpaca returns for an accepted order
+ORDER_OK_STATUSES = frozenset((200, 201))
+
+# Market clock state changes at most twice a day
+CLOCK_CACHE_SECONDS = 30
+# Account and positions are reused within a trading cycle; orders invalidate them
+ACCOUNT_CACHE_SECONDS = 10
+MARKET_TZ = ZoneInfo('America/New_York')
+
+# Response bodies are decoded with orjson straight from bytes
+_parse = orjson.loads
+
+def _quote_mid_price(quote: Optional[Dict]) -> Optional[float]:
+    """Mid price of an Alpaca v2 quote ('bp'/'ap' are already numbers)"""
+    if not quote:
+        return None
+    bid = quote.get('bp')
+    ask = quote.get('ap')
+    return (bid + ask) * 0.5 if bid and ask else None
+
 class AlpacaNode:
     """Node for Alpaca trading operations"""
     
+    __slots__ = (
+        'base_url', 'data_url', 'headers', '_client', '_clock_cache',
+        '_stop_loss_pct', '_take_profit_pct', '_sl_mul', '_tp_mul',
+        '_trading_start_hour', '_trading_end_hour', '_account_cache', '_positions_cache'
+    )
+    
     def __init__(self):
-        self.config = Config()
-        self.base_url = self.config.ALPACA_BASE_URL
-        self.data_url = self.config.ALPACA_DATA_URL
+        self.base_url = Config.ALPACA_BASE_URL
+        self.data_url = Config.ALPACA_DATA_URL
+        self._stop_loss_pct = Config.TRADING.stop_loss_percentage
+        self._take_profit_pct = Config.TRADING.take_profit_percentage
+        # Bracket price multipliers, fixed for the life of the node
+        self._sl_mul = 1.0 - self._stop_loss_pct / 100
+        self._tp_mul = 1.0 + self._take_profit_pct / 100
+        self._trading_start_hour = Config.TRADING.trading_hours.start
+        self._trading_end_hour = Config.TRADING.trading_hours.end
+        self._clock_cache = (float('-inf'), False)
+        self._account_cache = (float('-inf'), None)
+        self._positions_cache = (float('-inf'), {})
         
         self.headers = {
-            'APCA-API-KEY-ID': self.config.ALPACA_API_KEY,
-            'APCA-API-SECRET-KEY': self.config.ALPACA_SECRET_KEY,
-            'Content-Type': 'application/json'
+            'APCA-API-KEY-ID': Config.ALPACA_API_KEY,
+            'APCA-API-SECRET-KEY': Config.ALPACA_SECRET_KEY,
         }
         
-        logger.info(f"Alpaca Node initialized (Paper Trading: {self.config.TRADING_CONFIG['paper_trading']})")
+        # Persistent HTTP/2 client; concurrent calls multiplex over one connection.
+        # Every request first takes a token from the shared per-account budget.
+        self._client = httpx.Client(
+            headers=self.headers,
+            timeout=10.0,
+            event_hooks={'request': [lambda request: ALPACA_LIMITER.acquire()]},
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=16)
+            )
+        )
+        
+        logger.info("Alpaca Node initialized (Paper Trading: %s)", Config.TRADING.paper_trading)
     
     def get_account_info(self) -> Optional[Dict]:
-        """Get account information"""
+        """Get account information (cached for ACCOUNT_CACHE_SECONDS)"""
+        now = time.monotonic()
+        cached_at, account = self._account_cache
+        # Callers get shallow copies so they can't mutate the shared cache entry
+        if now - cached_at < ACCOUNT_CACHE_SECONDS and account is not None:
+            return dict(account)
+        
         try:
-            response = requests.get(
-                f"{self.base_url}/v2/account",
-                headers=self.headers
+            response = self._client.get(
+                f"{self.base_url}/v2/account"
             )
             
             if response.status_code == 200:
-                return response.json()
+                account = _parse(response.content)
+                self._account_cache = (now, account)
+                return dict(account)
             else:
-                logger.error(f"Failed to get account info: {response.status_code} - {response.text}")
+                logger.error("Failed to get account info: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            logger.error(f"Account info error: {str(e)}")
+            logger.error("Account info error: %s", e)
             return None
     
     def get_position(self, symbol: str) -> Optional[Dict]:
         """Get current position for a symbol"""
+        # A fresh get_all_positions result answers without another request
+        cached_at, positions = self._positions_cache
+        if time.monotonic() - cached_at < ACCOUNT_CACHE_SECONDS:
+            position = positions.get(symbol)
+            return dict(position) if position is not None else None
+        
         try:
-            response = requests.get(
-                f"{self.base_url}/v2/positions/{symbol}",
-                headers=self.headers
+            response = self._client.get(
+                f"{self.base_url}/v2/positions/{symbol}"
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _parse(response.content)
             elif response.status_code == 404:
                 # No position exists
                 return None
             else:
-                logger.error(f"Failed to get position for {symbol}: {response.status_code} - {response.text}")
+                logger.error("Failed to get position for %s: %s - %s", symbol, response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            logger.error(f"Position error for {symbol}: {str(e)}")
+            logger.error("Position error for %s: %s", symbol, e)
             return None
     
     def get_all_positions(self) -> List[Dict]:
-        """Get all current positions"""
+        """Get all current positions (cached for ACCOUNT_CACHE_SECONDS)"""
+        now = time.monotonic()
+        cached_at, positions = self._positions_cache
+        if now - cached_at < ACCOUNT_CACHE_SECONDS:
+            return [dict(p) for p in positions.values()]
+        
         try:
-            response = requests.get(
-                f"{self.base_url}/v2/positions",
-                headers=self.headers
+            response = self._client.get(
+                f"{self.base_url}/v2/positions"
             )
             
             if response.status_code == 200:
-                return response.json()
+                positions = _parse(response.content)
+                self._positions_cache = (now, {p['symbol']: dict(p) for p in positions})
+                return positions
             else:
-                logger.error(f"Failed to get positions: {response.status_code} - {response.text}")
+                logger.error("Failed to get positions: %s - %s", response.status_code, response.text)
                 return []
                 
         except Exception as e:
-            logger.error(f"Positions error: {str(e)}")
+            logger.error("Positions error: %s", e)
             return []
     
-    def place_buy_order(self, symbol: str, quantity: int, order_type: str = 'market') -> Optional[Dict]:
-        """Place a buy order"""
+    def place_buy_order(self, symbol: str, quantity: int, order_type: str = 'market',
+                        price: Optional[float] = None) -> Optional[Dict]:
+        """Place a buy order (price, if known, skips the quote lookup for the bracket)"""
         try:
             order_data = {
                 'symbol': symbol,
@@ -98,37 +171,40 @@ class AlpacaNode:
             }
             
             # Add stop loss and take profit if configured
-            if order_type == 'market':
-                stop_loss_pct = self.config.TRADING_CONFIG['stop_loss_percentage']
-                take_profit_pct = self.config.TRADING_CONFIG['take_profit_percentage']
-                
+            stop_loss_pct = self._stop_loss_pct
+            take_profit_pct = self._take_profit_pct
+            if order_type == 'market' and (stop_loss_pct > 0 or take_profit_pct > 0):
                 # Get current price for stop loss calculation
-                current_price = self._get_current_price(symbol)
+                current_price = price or self._get_current_price(symbol)
                 if current_price:
-                    order_data['order_class'] = 'bracket'
-                    order_data['stop_loss'] = {
-                        'stop_price': str(round(current_price * (1 - stop_loss_pct / 100), 2))
-                    }
-                    order_data['take_profit'] = {
-                        'limit_price': str(round(current_price * (1 + take_profit_pct / 100), 2))
-                    }
+                    # Both legs make a bracket; a single leg is one-triggers-other
+                    order_data['order_class'] = 'bracket' if stop_loss_pct > 0 and take_profit_pct > 0 else 'oto'
+                    if stop_loss_pct > 0:
+                        order_data['stop_loss'] = {
+                            'stop_price': f"{current_price * self._sl_mul:.2f}"
+                        }
+                    if take_profit_pct > 0:
+                        order_data['take_profit'] = {
+                            'limit_price': f"{current_price * self._tp_mul:.2f}"
+                        }
             
-            response = requests.post(
+            response = self._client.post(
                 f"{self.base_url}/v2/orders",
-                headers=self.headers,
-                data=json.dumps(order_data)
+                headers=JSON_HEADERS,
+                content=orjson.dumps(order_data)
             )
             
-            if response.status_code in [200, 201]:
-                result = response.json()
-                logger.info(f"Buy order placed for {symbol}: {quantity} shares - Order ID: {result.get('id', 'N/A')}")
+            if response.status_code in ORDER_OK_STATUSES:
+                self._invalidate_account_cache()
+                result = _parse(response.content)
+                logger.info("Buy order placed for %s: %s shares - Order ID: %s", symbol, quantity, result.get('id', 'N/A'))
                 return result
             else:
-                logger.error(f"Failed to place buy order for {symbol}: {response.status_code} - {response.text}")
+                logger.error("Failed to place buy order for %s: %s - %s", symbol, response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            logger.error(f"Buy order error for {symbol}: {str(e)}")
+            logger.error("Buy order error for %s: %s", symbol, e)
             return None
     
     def place_sell_order(self, symbol: str, quantity: int, order_type: str = 'market') -> Optional[Dict]:
@@ -137,14 +213,14 @@ class AlpacaNode:
             # Check if we have position to sell
             position = self.get_position(symbol)
             if not position:
-                logger.warning(f"No position to sell for {symbol}")
+                logger.warning("No position to sell for %s", symbol)
                 return None
             
             # Determine quantity to sell
             available_qty = int(position['qty'])
             if quantity > available_qty:
                 quantity = available_qty
-                logger.info(f"Adjusted sell quantity to {quantity} for {symbol}")
+                logger.info("Adjusted sell quantity to %s for %s", quantity, symbol)
             
             order_data = {
                 'symbol': symbol,
@@ -154,24 +230,30 @@ class AlpacaNode:
                 'time_in_force': 'day'
             }
             
-            response = requests.post(
+            response = self._client.post(
                 f"{self.base_url}/v2/orders",
-                headers=self.headers,
-                data=json.dumps(order_data)
+                headers=JSON_HEADERS,
+                content=orjson.dumps(order_data)
             )
             
-            if response.status_code in [200, 201]:
-                result = response.json()
-                logger.info(f"Sell order placed for {symbol}: {quantity} shares - Order ID: {result.get('id', 'N/A')}")
+            if response.status_code in ORDER_OK_STATUSES:
+                self._invalidate_account_cache()
+                result = _parse(response.content)
+                logger.info("Sell order placed for %s: %s shares - Order ID: %s", symbol, quantity, result.get('id', 'N/A'))
                 return result
             else:
-                logger.error(f"Failed to place sell order for {symbol}: {response.status_code} - {response.text}")
+                logger.error("Failed to place sell order for %s: %s - %s", symbol, response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            logger.error(f"Sell order error for {symbol}: {str(e)}")
+            logger.error("Sell order error for %s: %s", symbol, e)
             return None
     
+    def _invalidate_account_cache(self):
+        """Drop cached account and positions after an order changes them"""
+        self._account_cache = (float('-inf'), None)
+        self._positions_cache = (float('-inf'), {})
+    
     def get_orders(self, status: str = 'all', limit: int = 50) -> List[Dict]:
         """Get orders"""
         try:
@@ -181,39 +263,38 @@ class AlpacaNode:
                 'direction': 'desc'
             }
             
-            response = requests.get(
+            response = self._client.get(
                 f"{self.base_url}/v2/orders",
-                headers=self.headers,
                 params=params
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _parse(response.content)
             else:
-                logger.error(f"Failed to get orders: {response.status_code} - {response.text}")
+                logger.error("Failed to get orders: %s - %s", response.status_code, response.text)
                 return []
                 
         except Exception as e:
-            logger.error(f"Orders error: {str(e)}")
+            logger.error("Orders error: %s", e)
             return []
     
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order"""
         try:
-            response = requests.delete(
-                f"{self.base_url}/v2/orders/{order_id}",
-                headers=self.headers
+            response = self._client.delete(
+                f"{self.base_url}/v2/orders/{order_id}"
             )
             
             if response.status_code == 204:
-                logger.info(f"Order {order_id} cancelled successfully")
+                self._invalidate_account_cache()
+                logger.info("Order %s cancelled successfully", order_id)
                 return True
             else:
-                logger.error(f"Failed to cancel order {order_id}: {response.status_code} - {response.text}")
+                logger.error("Failed to cancel order %s: %s - %s", order_id, response.status_code, response.text)
                 return False
                 
         except Exception as e:
-            logger.error(f"Cancel order error: {str(e)}")
+            logger.error("Cancel order error: %s", e)
             return False
     
     def get_portfolio_history(self, period: str = '1M') -> Optional[Dict]:
@@ -224,59 +305,97 @@ class AlpacaNode:
                 'timeframe': '1Day'
             }
             
-            response = requests.get(
+            response = self._client.get(
                 f"{self.base_url}/v2/account/portfolio/history",
-                headers=self.headers,
                 params=params
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _parse(response.content)
             else:
-                logger.error(f"Failed to get portfolio history: {response.status_code} - {response.text}")
+                logger.error("Failed to get portfolio history: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            logger.error(f"Portfolio history error: {str(e)}")
+            logger.error("Portfolio history error: %s", e)
             return None
     
     def _get_current_price(self, symbol: str) -> Optional[float]:
         """Get current price for a symbol"""
         try:
-            response = requests.get(
-                f"{self.data_url}/v2/stocks/{symbol}/quotes/latest",
-                headers=self.headers
+            response = self._client.get(
+                f"{self.data_url}/v2/stocks/{symbol}/quotes/latest"
             )
             
             if response.status_code == 200:
-                data = response.json()
-                quote = data.get('quote', {})
-                bid = float(quote.get('bid_price', 0))
-                ask = float(quote.get('ask_price', 0))
-                
-                if bid > 0 and ask > 0:
-                    return (bid + ask) / 2
+                return _quote_mid_price(_parse(response.content).get('quote'))
                 
             return None
             
         except Exception as e:
-            logger.error(f"Current price error for {symbol}: {str(e)}")
+            logger.error("Current price error for %s: %s", symbol, e)
             return None
     
+    def _get_current_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Get current prices for several symbols concurrently"""
+        if not symbols:
+            return {}
+        
+        # Requests share the pooled client, so keep workers within max_connections
+        with ThreadPoolExecutor(max_workers=min(16, len(symbols))) as executor:
+            prices = executor.map(self._get_current_price, symbols)
+            return dict(zip(symbols, prices))
+    
+    def _get_prices_bulk(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Get current prices for several symbols with one snapshots request"""
+        if not symbols:
+            return {}
+        
+        try:
+            response = self._client.get(
+                f"{self.data_url}/v2/stocks/snapshots",
+                params={'symbols': ','.join(symbols)}
+            )
+            
+            if response.status_code == 200:
+                prices = {}
+                for symbol, snapshot in _parse(response.content).items():
+                    prices[symbol] = _quote_mid_price(snapshot.get('latestQuote') if snapshot else None)
+                return prices
+            
+            logger.warning("Snapshots request failed: %s - %s", response.status_code, response.text)
+            
+        except Exception as e:
+            logger.error("Bulk price error: %s", e)
+        
+        # Fall back to per-symbol quotes
+        return self._get_current_prices(symbols)
+    
     def is_market_open(self) -> bool:
-        """Check if market is currently open"""
+        """Check if market is currently open (cached for CLOCK_CACHE_SECONDS)"""
+        # Outside the configured trading window the market cannot be open
+        now_et = datetime.now(MARKET_TZ)
+        if now_et.weekday() >= 5 or not (self._trading_start_hour <= now_et.hour < self._trading_end_hour):
+            return False
+        
+        now = time.monotonic()
+        cached_at, is_open = self._clock_cache
+        if now - cached_at < CLOCK_CACHE_SECONDS:
+            return is_open
+        
         try:
-            response = requests.get(
-                f"{self.base_url}/v2/clock",
-                headers=self.headers
+            response = self._client.get(
+                f"{self.base_url}/v2/clock"
             )
             
             if response.status_code == 200:
-                data = response.json()
-                return data.get('is_open', False)
+                data = _parse(response.content)
+                is_open = data.get('is_open', False)
+                self._clock_cache = (now, is_open)
+                return is_open
             
             return False
             
         except Exception as e:
-            logger.error(f"Market status error: {str(e)}")
+            logger.error("Market status error: %s", e)
             return False
@@ -2,32 +2,128 @@
 Email Node - Handles email notifications and reports
 """
 
+import atexit
 import logging
+import queue
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import threading
+from string import Template
+from email.message import EmailMessage
+from email.policy import SMTP
 from typing import List, Dict, Optional
 from datetime import datetime
 import json
 
-from config import Config
+from config import get_config
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Outgoing mail waits here for the background sender
+EMAIL_QUEUE_SIZE = 256
+
+# Weekly/monthly report HTML: rows are filled with str.format_map, the page
+# sections are string.Templates compiled at import
+REPORT_ROW_TEMPLATE = """
+                <tr>
+                    <td>{timestamp}</td>
+                    <td>{symbol}</td>
+                    <td>{action}</td>
+                    <td>{quantity}</td>
+                    <td>${price:.2f}</td>
+                </tr>
+                """
+
+REPORT_ROW_DEFAULTS = {'symbol': 'N/A', 'action': 'N/A', 'quantity': 0, 'price': 0, 'timestamp': 'N/A'}
+
+REPORT_EMPTY_ROW = '<tr><td colspan="5">No trades this week</td></tr>'
+
+REPORT_HTML_HEADER = Template("""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <style>
+                    body { font-family: Arial, sans-serif; margin: 20px; }
+                    .header { background-color: #f8f9fa; padding: 20px; border-radius: 5px; }
+                    .metrics { display: flex; justify-content: space-around; margin: 20px 0; }
+                    .metric { text-align: center; padding: 15px; background-color: #e9ecef; border-radius: 5px; }
+                    .metric h3 { margin: 0; color: #333; }
+                    .metric p { margin: 5px 0 0 0; font-size: 24px; font-weight: bold; }
+                    .positive { color: #28a745; }
+                    .negative { color: #dc3545; }
+                    table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+                    th, td { padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }
+                    th { background-color: #f8f9fa; }
+                </style>
+            </head>
+            <body>
+                <div class="header">
+                    <h1>$title</h1>
+                    <p>Report Period: $report_date</p>
+                </div>
+                
+""")
+
+REPORT_HTML_METRICS = Template("""                <div class="metrics">
+                    <div class="metric">
+                        <h3>Total Trades</h3>
+                        <p>$total_trades</p>
+                    </div>
+                    <div class="metric">
+                        <h3>Win Rate</h3>
+                        <p>$win_rate%</p>
+                    </div>
+                    <div class="metric">
+                        <h3>P&L</h3>
+                        <p class="$pnl_class">$$$total_pnl</p>
+                    </div>
+                </div>
+                
+                <h2>Recent Trades</h2>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Time</th>
+                            <th>Symbol</th>
+                            <th>Action</th>
+                            <th>Quantity</th>
+                            <th>Price</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        """)
+
+REPORT_HTML_FOOTER = Template("""
+                    </tbody>
+                </table>
+                
+                <p style="margin-top: 30px; color: #666;">
+                    Generated by AI Trading Bot at $generated_at
+                </p>
+            </body>
+            </html>
+            """)
+
 class EmailNode:
     """Node for email notifications and reports"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.smtp_server = self.config.SMTP_SERVER
         self.smtp_port = self.config.SMTP_PORT
         self.username = self.config.EMAIL_USERNAME
         self.password = self.config.EMAIL_PASSWORD
         self.recipients = [email.strip() for email in self.config.EMAIL_RECIPIENTS if email.strip()]
         
+        # Logged-in SMTP connection reused across sends
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        atexit.register(self._close_smtp)
+        
+        # Sends happen on a daemon worker so callers never block on SMTP
+        self._queue = queue.Queue(maxsize=EMAIL_QUEUE_SIZE)
+        threading.Thread(target=self._worker, name="email-sender", daemon=True).start()
+        
         if not all([self.username, self.password, self.recipients]):
             logger.warning("Email configuration incomplete")
         else:
@@ -35,7 +131,7 @@ class EmailNode:
     
     def send_email(self, subject: str, body: str, html_body: Optional[str] = None, 
                    recipients: Optional[List[str]] = None) -> bool:
-        """Send email notification"""
+        """Queue an email for background delivery; True means queued, not delivered (SMTP failures are logged by the sender)"""
         if not self.username or not self.password:
             logger.warning("Email not configured, skipping send")
             return False
@@ -47,44 +143,101 @@ class EmailNode:
                 logger.warning("No email recipients configured")
                 return False
             
-            # Create message
-            msg = MIMEMultipart('alternative')
+            # Create message (SMTP policy serializes with CRLF line endings for the wire)
+            msg = EmailMessage(policy=SMTP)
             msg['Subject'] = subject
             msg['From'] = self.username
             msg['To'] = ', '.join(to_emails)
             
             # Add text part
-            text_part = MIMEText(body, 'plain')
-            msg.attach(text_part)
+            msg.set_content(body)
             
             # Add HTML part if provided
             if html_body:
-                html_part = MIMEText(html_body, 'html')
-                msg.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+                msg.add_alternative(html_body, subtype='html')
             
-            logger.info(f"Email sent successfully to {len(to_emails)} recipients")
+            # Serialize once; the worker hands the bytes straight to the server
+            self._queue.put_nowait((msg.as_bytes(), to_emails))
             return True
             
+        except queue.Full:
+            logger.warning(f"Email queue full, dropping: {subject}")
+            return False
         except Exception as e:
             logger.error(f"Email send error: {str(e)}")
             return False
     
+    def _worker(self):
+        """Deliver queued messages one at a time"""
+        while True:
+            raw_message, to_emails = self._queue.get()
+            try:
+                self._send_sync(raw_message, to_emails)
+                logger.info(f"Email sent successfully to {len(to_emails)} recipients")
+            except Exception as e:
+                logger.error(f"Email send error: {str(e)}")
+            finally:
+                self._queue.task_done()
+    
+    def _send_sync(self, raw_message: bytes, to_emails: List[str]):
+        """Send over the persistent connection, reconnecting once if it dropped"""
+        with self._smtp_lock:
+            try:
+                self._get_smtp().sendmail(self.username, to_emails, raw_message)
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = None
+                self._get_smtp().sendmail(self.username, to_emails, raw_message)
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return a live, logged-in SMTP connection (caller holds _smtp_lock)"""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop_smtp()
+        
+        # Port 465 is implicit TLS, which skips the STARTTLS round trip
+        if self.smtp_port == 465:
+            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            server.starttls()
+        server.login(self.username, self.password)
+        
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """Close the persistent SMTP connection, waiting for any send in progress"""
+        with self._smtp_lock:
+            self._drop_smtp()
+    
+    def _drop_smtp(self):
+        """Close the persistent SMTP connection (caller holds _smtp_lock)"""
+        server, self._smtp = self._smtp, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+    
     def send_weekly_report(self, report_data: Dict) -> bool:
-        """Send weekly trading report"""
+        """Queue the weekly trading report email (True means queued, see send_email)"""
         try:
-            subject = f"Weekly Trading Report - {datetime.now().strftime('%Y-%m-%d')}"
+            # One timestamp for the subject and both bodies
+            now = datetime.now()
+            date_str = now.strftime('%Y-%m-%d')
+            ts_str = now.strftime('%Y-%m-%d %H:%M:%S')
+            
+            subject = f"Weekly Trading Report - {date_str}"
             
             # Generate HTML report
-            html_body = self._generate_weekly_report_html(report_data)
+            html_body = self._generate_weekly_report_html(report_data, date_str, ts_str)
             
             # Generate text version
-            text_body = self._generate_weekly_report_text(report_data)
+            text_body = self._generate_weekly_report_text(report_data, date_str, ts_str)
             
             return self.send_email(subject, text_body, html_body)
             
@@ -93,15 +246,20 @@ class EmailNode:
             return False
     
     def send_monthly_report(self, report_data: Dict) -> bool:
-        """Send monthly trading report"""
+        """Queue the monthly trading report email (True means queued, see send_email)"""
         try:
-            subject = f"Monthly Trading Report - {datetime.now().strftime('%B %Y')}"
+            # One timestamp for the subject and both bodies
+            now = datetime.now()
+            date_str = now.strftime('%Y-%m-%d')
+            ts_str = now.strftime('%Y-%m-%d %H:%M:%S')
+            
+            subject = f"Monthly Trading Report - {now.strftime('%B %Y')}"
             
             # Generate HTML report
-            html_body = self._generate_monthly_report_html(report_data)
+            html_body = self._generate_monthly_report_html(report_data, date_str, ts_str)
             
             # Generate text version
-            text_body = self._generate_monthly_report_text(report_data)
+            text_body = self._generate_monthly_report_text(report_data, date_str, ts_str)
             
             return self.send_email(subject, text_body, html_body)
             
@@ -135,95 +293,32 @@ AI Trading Bot
             logger.error(f"Error notification error: {str(e)}")
             return False
     
-    def _generate_weekly_report_html(self, data: Dict) -> str:
+    def _generate_weekly_report_html(self, data: Dict, date_str: str, ts_str: str,
+                                     title: str = "Weekly Trading Report") -> str:
         """Generate HTML weekly report"""
         try:
-            trades = data.get('trades', [])
-            total_trades = len(trades)
+            trades = data.get('trades_preview', [])
+            total_trades = data.get('total_trades', len(trades))
             profitable_trades = data.get('profitable_trades', 0)
             total_pnl = data.get('total_pnl', 0)
             win_rate = data.get('win_rate', 0)
             
-            # Generate trades table
-            trades_html = ""
-            for trade in trades[-10:]:  # Last 10 trades
-                symbol = trade.get('symbol', 'N/A')
-                action = trade.get('action', 'N/A')
-                quantity = trade.get('quantity', 0)
-                price = trade.get('price', 0)
-                timestamp = trade.get('timestamp', 'N/A')
-                
-                trades_html += f"""
-                <tr>
-                    <td>{timestamp}</td>
-                    <td>{symbol}</td>
-                    <td>{action}</td>
-                    <td>{quantity}</td>
-                    <td>${price:.2f}</td>
-                </tr>
-                """
+            # Generate trades table (last 10 trades)
+            trades_html = "".join(
+                REPORT_ROW_TEMPLATE.format_map({**REPORT_ROW_DEFAULTS, **trade}) for trade in trades[-10:]
+            )
             
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                    .header {{ background-color: #f8f9fa; padding: 20px; border-radius: 5px; }}
-                    .metrics {{ display: flex; justify-content: space-around; margin: 20px 0; }}
-                    .metric {{ text-align: center; padding: 15px; background-color: #e9ecef; border-radius: 5px; }}
-                    .metric h3 {{ margin: 0; color: #333; }}
-                    .metric p {{ margin: 5px 0 0 0; font-size: 24px; font-weight: bold; }}
-                    .positive {{ color: #28a745; }}
-                    .negative {{ color: #dc3545; }}
-                    table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                    th, td {{ padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }}
-                    th {{ background-color: #f8f9fa; }}
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h1>Weekly Trading Report</h1>
-                    <p>Report Period: {datetime.now().strftime('%Y-%m-%d')}</p>
-                </div>
-                
-                <div class="metrics">
-                    <div class="metric">
-                        <h3>Total Trades</h3>
-                        <p>{total_trades}</p>
-                    </div>
-                    <div class="metric">
-                        <h3>Win Rate</h3>
-                        <p>{win_rate:.1f}%</p>
-                    </div>
-                    <div class="metric">
-                        <h3>P&L</h3>
-                        <p class="{'positive' if total_pnl >= 0 else 'negative'}">${total_pnl:+,.2f}</p>
-                    </div>
-                </div>
-                
-                <h2>Recent Trades</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Time</th>
-                            <th>Symbol</th>
-                            <th>Action</th>
-                            <th>Quantity</th>
-                            <th>Price</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {trades_html or '<tr><td colspan="5">No trades this week</td></tr>'}
-                    </tbody>
-                </table>
-                
-                <p style="margin-top: 30px; color: #666;">
-                    Generated by AI Trading Bot at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                </p>
-            </body>
-            </html>
-            """
+            html = (
+                REPORT_HTML_HEADER.substitute(title=title, report_date=date_str)
+                + REPORT_HTML_METRICS.substitute(
+                    total_trades=total_trades,
+                    win_rate=f"{win_rate:.1f}",
+                    pnl_class='positive' if total_pnl >= 0 else 'negative',
+                    total_pnl=f"{total_pnl:+,.2f}"
+                )
+                + (trades_html or REPORT_EMPTY_ROW)
+                + REPORT_HTML_FOOTER.substitute(generated_at=ts_str)
+            )
             
             return html
             
@@ -231,18 +326,18 @@ AI Trading Bot
             logger.error(f"HTML report generation error: {str(e)}")
             return "<html><body><h1>Error generating report</h1></body></html>"
     
-    def _generate_weekly_report_text(self, data: Dict) -> str:
+    def _generate_weekly_report_text(self, data: Dict, date_str: str, ts_str: str) -> str:
         """Generate text weekly report"""
         try:
-            trades = data.get('trades', [])
-            total_trades = len(trades)
+            trades = data.get('trades_preview', [])
+            total_trades = data.get('total_trades', len(trades))
             profitable_trades = data.get('profitable_trades', 0)
             total_pnl = data.get('total_pnl', 0)
             win_rate = data.get('win_rate', 0)
             
             report = f"""
 Weekly Trading Report
-Date: {datetime.now().strftime('%Y-%m-%d')}
+Date: {date_str}
 
 PERFORMANCE SUMMARY
 ==================
@@ -270,7 +365,7 @@ RECENT TRADES
             report += f"""
 
 Report generated by AI Trading Bot
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{ts_str}
 """
             
             return report
@@ -279,12 +374,12 @@ Report generated by AI Trading Bot
             logger.error(f"Text report generation error: {str(e)}")
             return "Error generating report"
     
-    def _generate_monthly_report_html(self, data: Dict) -> str:
+    def _generate_monthly_report_html(self, data: Dict, date_str: str, ts_str: str) -> str:
         """Generate HTML monthly report (more detailed)"""
         # Similar to weekly but more comprehensive
-        return self._generate_weekly_report_html(data)
+        return self._generate_weekly_report_html(data, date_str, ts_str, title="Monthly Trading Report")
     
-    def _generate_monthly_report_text(self, data: Dict) -> str:
+    def _generate_monthly_report_text(self, data: Dict, date_str: str, ts_str: str) -> str:
         """Generate text monthly report (more detailed)"""
         # Similar to weekly but more comprehensive
-        return self._generate_weekly_report_text(data)
+        return self._generate_weekly_report_text(data, date_str, ts_str)
@@ -3,36 +3,210 @@ Price Data Node - Fetches price data from multiple sources
 """
 
 import logging
+import math
+import threading
+import time
+import httpx
+import orjson
 import requests
-from typing import Dict, Optional, List
-import json
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Optional, List, Tuple
+from array import array
+from datetime import date, datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
+from statistics import fmean
 
-from config import Config
+try:
+    import redis
+except ImportError:  # optional shared cache
+    redis = None
+
+from config import get_config
 from utils.logger import setup_logger
+from utils.rate_limiter import ALPACA_LIMITER, ALPHA_VANTAGE_LIMITER
 
 logger = setup_logger()
 
+# Upper bound on symbols fetched in parallel by get_multiple_quotes
+MAX_QUOTE_WORKERS = 8
+
+# Quote/trade-derived price data goes stale quickly; daily bars only change once a day
+PRICE_CACHE_SECONDS = 10
+BARS_CACHE_SECONDS = 3600
+PRICE_CACHE_SIZE = 4096
+
+# Threads for the trade/bars requests issued alongside each quote request
+FETCH_WORKERS = 16
+
+# Concurrent single-symbol lookups arriving within this window share one batched Alpaca call;
+# a lookup with no other lookup in flight is sent at once
+PRICE_BATCH_WINDOW_SECONDS = 0.05
+PRICE_BATCH_SIZE = 50
+
+# Daily bars are kept column-wise (one list per field) rather than as a list of dicts
+BAR_FIELDS = ('close', 'high', 'low', 'volume')
+
+def _bars_to_columns(bars: List[Dict]) -> Dict[str, List]:
+    """Turn a list of bar dicts into {field: [values]}, with None where a bar lacks the field"""
+    return {field: [bar.get(field) for bar in bars] for field in BAR_FIELDS}
+
+def _bars_redis_key(symbol: str, day: date) -> str:
+    """Shared-cache key for a symbol's packed daily bars"""
+    return f"alpaca:bars-f64:{symbol}:{day.isoformat()}"
+
+def _empty_bars() -> Dict[str, List]:
+    """Column-wise bars with no rows"""
+    return {field: [] for field in BAR_FIELDS}
+
+def _pack_bars(bars_data: Dict[str, List]) -> bytes:
+    """Serialize column-wise bars as raw float64 columns back to back, NaN standing in for None"""
+    packed = array('d')
+    for field in BAR_FIELDS:
+        packed.extend(math.nan if value is None else float(value) for value in bars_data[field])
+    return packed.tobytes()
+
+def _unpack_bars(raw: bytes) -> Dict[str, List]:
+    """Inverse of _pack_bars"""
+    packed = array('d')
+    packed.frombytes(raw)
+    rows = len(packed) // len(BAR_FIELDS)
+    return {
+        field: [None if math.isnan(value) else value for value in packed[i * rows:(i + 1) * rows]]
+        for i, field in enumerate(BAR_FIELDS)
+    }
+
+@lru_cache(maxsize=8)
+def _bars_window(today: date) -> Tuple[str, str]:
+    """ISO start/end for the 60-day daily bars request, computed once per day"""
+    # End at midnight: today's partial bar is left out, the live price stands in for it
+    end_time = datetime.combine(today, datetime.min.time())
+    start_time = end_time - timedelta(days=60)  # 60 days of data
+    return start_time.isoformat(), end_time.isoformat()
+
+def _rsi(prices: List[float], period: int) -> float:
+    """RSI over the last `period` price changes, accumulated in one scalar loop"""
+    if len(prices) < period + 1:
+        return 50.0
+    
+    gain = loss = 0.0
+    window = prices[-(period + 1):]
+    prev = window[0]
+    for price in window[1:]:
+        change = price - prev
+        if change > 0:
+            gain += change
+        else:
+            loss -= change
+        prev = price
+    
+    if loss == 0:
+        return 100.0
+    
+    # avg_gain / avg_loss share the same divisor, so it cancels out
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+def _ema(values: List[float], period: int) -> Optional[float]:
+    """EMA seeded with the SMA of the first `period` values, or None if too few"""
+    if len(values) < period:
+        return None
+    
+    k = 2 / (period + 1)
+    ema = fmean(values[:period])
+    for value in values[period:]:
+        ema += k * (value - ema)
+    return ema
+
+def _ema_step(ema: Optional[float], price: float, period: int) -> float:
+    """Fold one more price into an EMA; without enough history the price stands in"""
+    if ema is None:
+        return price
+    return ema + 2 / (period + 1) * (price - ema)
+
 class PriceDataNode:
     """Node for fetching price data with fallback sources"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.alpaca_headers = {
             'APCA-API-KEY-ID': self.config.ALPACA_API_KEY,
             'APCA-API-SECRET-KEY': self.config.ALPACA_SECRET_KEY,
         }
         
+        # Persistent HTTP/2 client for Alpaca; concurrent quote/trade/bars calls
+        # from the worker threads multiplex over one TLS connection
+        self.client = httpx.Client(
+            headers=self.alpaca_headers,
+            timeout=10.0,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+            )
+        )
+        
+        # Keep-alive connection pool for Alpha Vantage (HTTP/1.1 only)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False)
+        ))
+        
+        # Runs the trade and bars requests of _get_alpaca_price_data concurrently
+        self._fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="price-fetch")
+        
+        # TTL caches: symbol -> (fetched_at, price_data), (symbol, day) -> (fetched_at, bars)
+        # and (symbol, day, price) -> (fetched_at, (bars, indicators))
+        self._price_cache = {}
+        self._bars_cache = {}
+        self._indicator_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # Pending single-symbol Alpaca lookups waiting to be coalesced: symbol -> Future
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._active_lookups = 0
+        
+        # Optional Redis layer so bars are shared across processes and restarts
+        self.redis = None
+        if self.config.REDIS_URL:
+            if redis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed")
+            else:
+                self.redis = redis.Redis.from_url(self.config.REDIS_URL, socket_timeout=0.5)
+        
         logger.info("Price Data Node initialized")
     
+    def _alpaca_get(self, url: str, params: Optional[Dict] = None) -> httpx.Response:
+        """GET an Alpaca data endpoint within the account's request budget"""
+        ALPACA_LIMITER.acquire()
+        return self.client.get(url, params=params)
+    
+    def _alpha_vantage_get(self, url: str, params: Dict) -> requests.Response:
+        """GET an Alpha Vantage endpoint within the API key's request budget"""
+        ALPHA_VANTAGE_LIMITER.acquire()
+        return self.session.get(url, params=params)
+    
     def get_price_data(self, symbol: str) -> Optional[Dict]:
         """Get comprehensive price data for a symbol with fallback sources"""
         try:
-            # Try Alpaca first (primary source)
-            price_data = self._get_alpaca_price_data(symbol)
+            cached = self._cache_get(self._price_cache, symbol, PRICE_CACHE_SECONDS)
+            if cached is not None:
+                logger.debug(f"Price data cache hit for {symbol}")
+                return dict(cached)
+            logger.debug(f"Price data cache miss for {symbol}")
+            
+            # Try Alpaca first (primary source), coalesced with concurrent lookups
+            price_data = self._get_alpaca_price_data_coalesced(symbol)
             
             if price_data:
                 logger.info(f"Got price data from Alpaca for {symbol}")
+                self._cache_put(self._price_cache, symbol, dict(price_data))
                 return price_data
             
             # Fallback to Alpha Vantage
@@ -41,6 +215,7 @@ class PriceDataNode:
             
             if price_data:
                 logger.info(f"Got price data from Alpha Vantage for {symbol}")
+                self._cache_put(self._price_cache, symbol, dict(price_data))
                 return price_data
             
             logger.error(f"All price data sources failed for {symbol}")
@@ -50,76 +225,305 @@ class PriceDataNode:
             logger.error(f"Price data error for {symbol}: {str(e)}")
             return None
     
+    def _get_alpaca_price_data_coalesced(self, symbol: str) -> Optional[Dict]:
+        """Share one multi-symbol request with concurrent callers; a lone caller goes straight out"""
+        with self._pending_lock:
+            self._active_lookups += 1
+            future = self._pending.get(symbol)
+            is_leader = False
+            flush_now = False
+            if future is None:
+                future = Future()
+                self._pending[symbol] = future
+                # The first caller of a window waits it out and then flushes, unless
+                # nobody else is looking up prices and there is nothing to wait for
+                is_leader = len(self._pending) == 1
+                flush_now = len(self._pending) >= PRICE_BATCH_SIZE or self._active_lookups == 1
+        
+        try:
+            if flush_now:
+                self._flush_pending()
+            elif is_leader:
+                time.sleep(PRICE_BATCH_WINDOW_SECONDS)
+                self._flush_pending()
+            
+            return future.result()
+        finally:
+            with self._pending_lock:
+                self._active_lookups -= 1
+    
+    def _flush_pending(self):
+        """Resolve every pending lookup with one batched Alpaca call"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        
+        try:
+            if len(pending) == 1:
+                symbol = next(iter(pending))
+                results = {symbol: self._get_alpaca_price_data(symbol)}
+            else:
+                results = self.get_multiple_quotes_batched(list(pending))
+        except Exception as e:
+            logger.error(f"Coalesced price lookup error: {str(e)}")
+            results = {}
+        
+        for symbol, future in pending.items():
+            future.set_result(results.get(symbol))
+    
     def _get_alpaca_price_data(self, symbol: str) -> Optional[Dict]:
         """Get price data from Alpaca"""
         try:
+            # Trade and bars don't depend on the quote, so fetch them alongside it
+            trade_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/{symbol}/trades/latest"
+            trade_future = self._fetch_pool.submit(self._alpaca_get, trade_url)
+            bars_future = self._fetch_pool.submit(self._get_alpaca_bars, symbol)
+            
             # Get latest quote
             quote_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/{symbol}/quotes/latest"
-            quote_response = requests.get(quote_url, headers=self.alpaca_headers)
+            quote_response = self._alpaca_get(quote_url)
             
             if quote_response.status_code != 200:
                 logger.warning(f"Alpaca quote failed for {symbol}: {quote_response.status_code}")
                 return None
             
-            quote_data = quote_response.json().get('quote', {})
-            
-            # Get latest trade
-            trade_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/{symbol}/trades/latest"
-            trade_response = requests.get(trade_url, headers=self.alpaca_headers)
+            quote_data = orjson.loads(quote_response.content).get('quote', {})
             
+            # A failed trade or bars fetch degrades the result instead of dropping the quote
             trade_data = {}
-            if trade_response.status_code == 200:
-                trade_data = trade_response.json().get('trade', {})
-            
-            # Get bars for historical data
-            bars_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/{symbol}/bars"
-            end_time = datetime.now()
-            start_time = end_time - timedelta(days=60)  # 60 days of data
-            
-            bars_params = {
-                'start': start_time.isoformat(),
-                'end': end_time.isoformat(),
-                'timeframe': '1Day',
-                'limit': 50
-            }
+            try:
+                trade_response = trade_future.result()
+                if trade_response.status_code == 200:
+                    trade_data = orjson.loads(trade_response.content).get('trade', {})
+            except Exception as e:
+                logger.warning(f"Alpaca trade fetch failed for {symbol}: {str(e)}")
             
-            bars_response = requests.get(bars_url, headers=self.alpaca_headers, params=bars_params)
-            bars_data = []
-            if bars_response.status_code == 200:
-                bars_data = bars_response.json().get('bars', [])
-            
-            # Calculate current price
-            current_price = 0
-            if trade_data.get('price'):
-                current_price = float(trade_data['price'])
-            elif quote_data.get('bid_price') and quote_data.get('ask_price'):
-                bid = float(quote_data['bid_price'])
-                ask = float(quote_data['ask_price'])
-                current_price = (bid + ask) / 2
-            
-            if current_price == 0:
-                return None
+            try:
+                bars_data = bars_future.result()
+            except Exception as e:
+                logger.warning(f"Alpaca bars fetch failed for {symbol}: {str(e)}")
+                bars_data = _empty_bars()
             
-            # Calculate technical indicators
-            indicators = self._calculate_indicators(bars_data, current_price)
+            return self._build_alpaca_price_data(symbol, quote_data, trade_data, bars_data)
             
-            # Build comprehensive price data
-            price_data = {
-                'symbol': symbol,
-                'current_price': current_price,
-                'bid_price': float(quote_data.get('bid_price', 0)),
-                'ask_price': float(quote_data.get('ask_price', 0)),
-                'volume': int(trade_data.get('size', 0)),
-                'timestamp': datetime.now().isoformat(),
-                'source': 'alpaca',
-                **indicators
-            }
+        except Exception as e:
+            logger.error(f"Alpaca price data error for {symbol}: {str(e)}")
+            return None
+    
+    def _build_alpaca_price_data(self, symbol: str, quote_data: Dict, trade_data: Dict,
+                                 bars_data: Dict[str, List]) -> Optional[Dict]:
+        """Combine Alpaca quote, trade and bars payloads into price data"""
+        # Calculate current price
+        current_price = 0
+        if trade_data.get('price'):
+            current_price = float(trade_data['price'])
+        elif quote_data.get('bid_price') and quote_data.get('ask_price'):
+            bid = float(quote_data['bid_price'])
+            ask = float(quote_data['ask_price'])
+            current_price = (bid + ask) / 2
+        
+        if current_price == 0:
+            return None
+        
+        # Calculate technical indicators
+        indicators = self._calculate_indicators(bars_data, current_price, symbol)
+        
+        # Build comprehensive price data
+        price_data = {
+            'symbol': symbol,
+            'current_price': current_price,
+            'bid_price': float(quote_data.get('bid_price', 0)),
+            'ask_price': float(quote_data.get('ask_price', 0)),
+            'volume': int(trade_data.get('size', 0)),
+            'timestamp': datetime.now().isoformat(),
+            'source': 'alpaca',
+            **indicators
+        }
+        
+        return price_data
+    
+    def get_multiple_quotes_batched(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get Alpaca price data for many symbols with one quotes, one trades and one bars call"""
+        if not symbols:
+            return {}
+        
+        try:
+            base_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks"
+            params = {'symbols': ','.join(symbols)}
             
-            return price_data
+            quote_response = self._alpaca_get(f"{base_url}/quotes/latest", params=params)
+            if quote_response.status_code != 200:
+                logger.warning(f"Alpaca batch quotes failed: {quote_response.status_code}")
+                return {}
+            quotes = orjson.loads(quote_response.content).get('quotes', {})
+            
+            trade_response = self._alpaca_get(f"{base_url}/trades/latest", params=params)
+            trades = {}
+            if trade_response.status_code == 200:
+                trades = orjson.loads(trade_response.content).get('trades', {})
+            
+            bars = self._get_alpaca_bars_batch(symbols)
+            
+            results = {}
+            for symbol in symbols:
+                if symbol not in quotes:
+                    continue
+                price_data = self._build_alpaca_price_data(
+                    symbol, quotes[symbol], trades.get(symbol, {}), bars.get(symbol) or _empty_bars()
+                )
+                if price_data:
+                    self._cache_put(self._price_cache, symbol, dict(price_data))
+                    results[symbol] = price_data
+            
+            logger.info(f"Got batched Alpaca price data for {len(results)}/{len(symbols)} symbols")
+            return results
             
         except Exception as e:
-            logger.error(f"Alpaca price data error for {symbol}: {str(e)}")
+            logger.error(f"Alpaca batch price data error: {str(e)}")
+            return {}
+    
+    def _get_alpaca_bars_batch(self, symbols: List[str]) -> Dict[str, Dict[str, List]]:
+        """Get daily bars for several symbols, fetching only cache misses in one paged call"""
+        today = date.today()
+        results = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._cache_get(self._bars_cache, (symbol, today), BARS_CACHE_SECONDS)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return results
+        
+        # Other processes may already have fetched today's bars into the shared cache
+        for symbol, raw in zip(missing, self._redis_mget([_bars_redis_key(symbol, today) for symbol in missing])):
+            if raw is not None:
+                bars_data = _unpack_bars(raw)
+                self._cache_put(self._bars_cache, (symbol, today), bars_data)
+                results[symbol] = bars_data
+        missing = [symbol for symbol in missing if symbol not in results]
+        
+        if not missing:
+            return results
+        
+        start_iso, end_iso = _bars_window(today)
+        
+        # Multi-symbol limit counts bars across all symbols, so scale it and follow pages
+        params = {
+            'symbols': ','.join(missing),
+            'start': start_iso,
+            'end': end_iso,
+            'timeframe': '1Day',
+            'limit': min(10000, 50 * len(missing))
+        }
+        fetched = {}
+        while True:
+            response = self._alpaca_get(f"{self.config.ALPACA_DATA_URL}/v2/stocks/bars", params=params)
+            if response.status_code != 200:
+                # Failed or truncated history is returned empty but never cached, so the next call retries
+                logger.warning(f"Alpaca batch bars failed: {response.status_code}")
+                for symbol in missing:
+                    results[symbol] = _empty_bars()
+                return results
+            
+            payload = orjson.loads(response.content)
+            for symbol, symbol_bars in (payload.get('bars') or {}).items():
+                fetched.setdefault(symbol, []).extend(symbol_bars)
+            
+            page_token = payload.get('next_page_token')
+            if not page_token:
+                break
+            params['page_token'] = page_token
+        
+        for symbol in missing:
+            bars_data = _bars_to_columns(fetched.get(symbol, []))
+            self._cache_put(self._bars_cache, (symbol, today), bars_data)
+            self._redis_set(_bars_redis_key(symbol, today), _pack_bars(bars_data), BARS_CACHE_SECONDS)
+            results[symbol] = bars_data
+        
+        return results
+    
+    def _get_alpaca_bars(self, symbol: str) -> Dict[str, List]:
+        """Get 60 days of daily bars from Alpaca, cached for the trading day"""
+        key = (symbol, date.today())
+        cached = self._cache_get(self._bars_cache, key, BARS_CACHE_SECONDS)
+        if cached is not None:
+            logger.debug(f"Bars cache hit for {symbol}")
+            return cached
+        logger.debug(f"Bars cache miss for {symbol}")
+        
+        redis_key = _bars_redis_key(symbol, key[1])
+        raw = self._redis_get(redis_key)
+        if raw is not None:
+            bars_data = _unpack_bars(raw)
+            self._cache_put(self._bars_cache, key, bars_data)
+            return bars_data
+        
+        bars_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/{symbol}/bars"
+        start_iso, end_iso = _bars_window(key[1])
+        
+        bars_params = {
+            'start': start_iso,
+            'end': end_iso,
+            'timeframe': '1Day',
+            'limit': 50
+        }
+        
+        bars_response = self._alpaca_get(bars_url, params=bars_params)
+        bars_data = _empty_bars()
+        if bars_response.status_code == 200:
+            bars_data = _bars_to_columns(orjson.loads(bars_response.content).get('bars') or [])
+            self._cache_put(self._bars_cache, key, bars_data)
+            self._redis_set(redis_key, _pack_bars(bars_data), BARS_CACHE_SECONDS)
+        
+        return bars_data
+    
+    def _redis_get(self, key: str) -> Optional[bytes]:
+        """Read a raw value from the shared cache; outages fall through to HTTP"""
+        if self.redis is None:
             return None
+        try:
+            return self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Redis get failed for {key}: {str(e)}")
+            return None
+    
+    def _redis_mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Read several raw values from the shared cache in one round trip; outages read as misses"""
+        if self.redis is None:
+            return [None] * len(keys)
+        try:
+            return self.redis.mget(keys)
+        except Exception as e:
+            logger.warning(f"Redis mget failed for {len(keys)} keys: {str(e)}")
+            return [None] * len(keys)
+    
+    def _redis_set(self, key: str, value: bytes, ttl: int):
+        """Write a raw value to the shared cache with a TTL"""
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(key, ttl, value)
+        except Exception as e:
+            logger.warning(f"Redis set failed for {key}: {str(e)}")
+    
+    def _cache_get(self, cache: Dict, key, ttl: float):
+        """Return a cached value younger than ttl seconds, or None"""
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    def _cache_put(self, cache: Dict, key, value):
+        """Store a value, evicting the oldest entry when the cache is full"""
+        with self._cache_lock:
+            if len(cache) >= PRICE_CACHE_SIZE and key not in cache:
+                del cache[next(iter(cache))]
+            cache.pop(key, None)
+            cache[key] = (time.monotonic(), value)
     
     def _get_alpha_vantage_data(self, symbol: str) -> Optional[Dict]:
         """Get price data from Alpha Vantage as fallback"""
@@ -137,12 +541,12 @@ class PriceDataNode:
                 'apikey': self.config.ALPHA_VANTAGE_API_KEY
             }
             
-            response = requests.get(url, params=params)
+            response = self._alpha_vantage_get(url, params=params)
             
             if response.status_code != 200:
                 return None
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Check for API limit or error
             if 'Error Message' in data or 'Note' in data:
@@ -167,23 +571,23 @@ class PriceDataNode:
                 'apikey': self.config.ALPHA_VANTAGE_API_KEY
             }
             
-            daily_response = requests.get(url, params=daily_params)
+            daily_response = self._alpha_vantage_get(url, params=daily_params)
             daily_data = {}
             if daily_response.status_code == 200:
-                daily_json = daily_response.json()
+                daily_json = orjson.loads(daily_response.content)
                 daily_data = daily_json.get('Time Series (Daily)', {})
             
             # Calculate indicators from daily data
-            bars_data = []
-            for date, values in list(daily_data.items())[:50]:
-                bars_data.append({
-                    'close': float(values['4. close']),
-                    'high': float(values['2. high']),
-                    'low': float(values['3. low']),
-                    'volume': int(values['5. volume'])
-                })
+            bars_data = _empty_bars()
+            closes, highs, lows, volumes = (bars_data[field] for field in BAR_FIELDS)
+            # Alpha Vantage lists dates newest first; take the latest 50 without copying the series
+            for date_str, values in islice(daily_data.items(), 50):
+                closes.append(float(values['4. close']))
+                highs.append(float(values['2. high']))
+                lows.append(float(values['3. low']))
+                volumes.append(int(values['5. volume']))
             
-            indicators = self._calculate_indicators(bars_data, current_price)
+            indicators = self._calculate_indicators(bars_data, current_price, symbol)
             
             price_data = {
                 'symbol': symbol,
@@ -200,115 +604,103 @@ class PriceDataNode:
             logger.error(f"Alpha Vantage price data error for {symbol}: {str(e)}")
             return None
     
-    def _calculate_indicators(self, bars_data: List[Dict], current_price: float) -> Dict:
+    def _calculate_indicators(self, bars_data: Dict[str, List], current_price: float,
+                              symbol: Optional[str] = None) -> Dict:
         """Calculate technical indicators from historical data"""
-        try:
-            if len(bars_data) < 20:
-                # Not enough data for indicators
-                return {
-                    'ma_20': current_price,
-                    'ma_50': current_price,
-                    'rsi': 50,
-                    'price_change_percent': 0,
-                    'volatility': 0
-                }
-            
-            # Extract closing prices
-            closes = [float(bar.get('close', current_price)) for bar in bars_data]
-            closes.reverse()  # Ensure chronological order
-            
-            # Add current price
-            closes.append(current_price)
-            
-            # Moving averages
-            ma_20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else current_price
-            ma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else current_price
-            
-            # Price change percentage (from yesterday)
-            price_change_percent = 0
-            if len(closes) > 1:
-                yesterday_price = closes[-2]
-                price_change_percent = ((current_price - yesterday_price) / yesterday_price) * 100
-            
-            # RSI calculation (simplified)
-            rsi = self._calculate_rsi(closes[-14:]) if len(closes) >= 14 else 50
-            
-            # Volatility (standard deviation of returns)
-            volatility = 0
-            if len(closes) > 10:
-                returns = []
-                for i in range(1, min(21, len(closes))):
-                    ret = (closes[-i] - closes[-i-1]) / closes[-i-1]
-                    returns.append(ret)
-                
-                if returns:
-                    avg_return = sum(returns) / len(returns)
-                    variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
-                    volatility = (variance ** 0.5) * 100  # As percentage
-            
-            return {
-                'ma_20': round(ma_20, 2),
-                'ma_50': round(ma_50, 2),
-                'rsi': round(rsi, 1),
-                'price_change_percent': round(price_change_percent, 2),
-                'volatility': round(volatility, 2)
-            }
-            
-        except Exception as e:
-            logger.error(f"Indicators calculation error: {str(e)}")
+        # Not enough data for indicators, or a zero close that would divide by zero
+        if len(bars_data['close']) < 20 or 0 in bars_data['close']:
             return {
                 'ma_20': current_price,
                 'ma_50': current_price,
+                'ema_20': current_price,
+                'ema_50': current_price,
                 'rsi': 50,
                 'price_change_percent': 0,
                 'volatility': 0
             }
+        
+        # Same bars and same live price as an earlier call: reuse its result
+        key = (symbol, date.today(), current_price)
+        if symbol:
+            cached = self._cache_get(self._indicator_cache, key, BARS_CACHE_SECONDS)
+            if cached is not None and cached[0] is bars_data:
+                return cached[1]
+        
+        # Extract closing prices
+        closes = [current_price if close is None else float(close)
+                  for close in reversed(bars_data['close'])]  # Ensure chronological order
+        
+        # Add current price
+        closes.append(current_price)
+        n = len(closes)
+        
+        # Moving averages
+        ma_20 = fmean(closes[-20:]) if n >= 20 else current_price
+        ma_50 = fmean(closes[-50:]) if n >= 50 else current_price
+        
+        # Exponential moving averages over the history, then the live price
+        ema_20 = _ema_step(_ema(closes[:-1], 20), current_price, 20)
+        ema_50 = _ema_step(_ema(closes[:-1], 50), current_price, 50)
+        
+        # Price change percentage (from yesterday)
+        price_change_percent = 0
+        if n > 1:
+            yesterday_price = closes[-2]
+            price_change_percent = ((current_price - yesterday_price) / yesterday_price) * 100
+        
+        # RSI calculation (simplified)
+        rsi = self._calculate_rsi(closes[-14:]) if n >= 14 else 50
+        
+        # Volatility (standard deviation of up to 20 most recent returns)
+        volatility = 0
+        if n > 10:
+            window = closes[-21:]
+            returns = [(curr - prev) / prev for prev, curr in zip(window, window[1:])]
+            avg_return = fmean(returns)
+            variance = fmean([(r - avg_return) ** 2 for r in returns])
+            volatility = (variance ** 0.5) * 100  # As percentage
+        
+        indicators = {
+            'ma_20': round(ma_20, 2),
+            'ma_50': round(ma_50, 2),
+            'ema_20': round(ema_20, 2),
+            'ema_50': round(ema_50, 2),
+            'rsi': round(rsi, 1),
+            'price_change_percent': round(price_change_percent, 2),
+            'volatility': round(volatility, 2)
+        }
+        if symbol:
+            self._cache_put(self._indicator_cache, key, (bars_data, indicators))
+        return indicators
     
     def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate RSI (Relative Strength Index)"""
-        try:
-            if len(prices) < period + 1:
-                return 50.0
-            
-            gains = []
-            losses = []
-            
-            for i in range(1, len(prices)):
-                change = prices[i] - prices[i-1]
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-            
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-            
-            if avg_loss == 0:
-                return 100.0
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
-            
-        except Exception as e:
-            logger.error(f"RSI calculation error: {str(e)}")
-            return 50.0
+        return _rsi(prices, period)
     
     def get_multiple_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
-        """Get price data for multiple symbols"""
-        results = {}
+        """Get price data for multiple symbols concurrently"""
+        if not symbols:
+            return {}
         
-        for symbol in symbols:
-            try:
-                price_data = self.get_price_data(symbol)
-                if price_data:
-                    results[symbol] = price_data
-                else:
-                    logger.warning(f"Failed to get price data for {symbol}")
-            except Exception as e:
-                logger.error(f"Error getting data for {symbol}: {str(e)}")
+        # One batched Alpaca round trip per endpoint covers most symbols
+        results = self.get_multiple_quotes_batched(symbols)
+        remaining = [symbol for symbol in symbols if symbol not in results]
+        if not remaining:
+            return results
         
-        return results
+        # The rest go through the per-symbol path (with Alpha Vantage fallback) across threads
+        with ThreadPoolExecutor(max_workers=min(MAX_QUOTE_WORKERS, len(remaining))) as executor:
+            futures = {executor.submit(self.get_price_data, symbol): symbol for symbol in remaining}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    price_data = future.result()
+                    if price_data:
+                        results[symbol] = price_data
+                    else:
+                        logger.warning(f"Failed to get price data for {symbol}")
+                except Exception as e:
+                    logger.error(f"Error getting data for {symbol}: {str(e)}")
+        
+        # Keep the caller's symbol order
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
@@ -2,70 +2,219 @@
 Report Generator Node - Creates trading reports and analytics
 """
 
+import heapq
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import accumulate
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
 import json
 
-from config import Config
+from config import get_config
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Estimated per-trade P&L: high-confidence trades gain 2%, the rest lose 1% of notional
+WIN_CONFIDENCE = 7
+WIN_RETURN = 0.02
+LOSS_RETURN = -0.01
+
+# Reports are reused for this long while the history and positions look unchanged
+REPORT_CACHE_SECONDS = 60
+REPORT_CACHE_SIZE = 32
+
+# Reports carry only the most recent trades of their period, under 'trades_preview'
+REPORT_TRADE_PREVIEW = 10
+
+# Trading days reported in the weekly day-of-week breakdown, in weekday() order
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+
+@dataclass(slots=True, frozen=True)
+class _TradeView:
+    """Per-trade columns for a report's trades, shared by the metric helpers"""
+    notionals: List[float]
+    wins: Sequence[int]  # 1 for a win, 0 otherwise
+    pnls: List[float]
+    timestamps: List[Optional[datetime]]
+    symbols: List[str]
+    actions: List[Optional[str]]
+
+def _build_view(trades: List[Dict]) -> _TradeView:
+    """Scan the trades once for every field the metric helpers need"""
+    notionals = [trade.get('price', 0) * trade.get('quantity', 0) for trade in trades]
+    wins = [trade.get('confidence', 0) >= WIN_CONFIDENCE for trade in trades]
+    pnls = [value * WIN_RETURN if win else value * LOSS_RETURN for value, win in zip(notionals, wins)]
+    timestamps = [ts if isinstance(ts := trade.get('timestamp'), datetime) else None for trade in trades]
+    symbols = [trade.get('symbol', 'Unknown') for trade in trades]
+    actions = [trade.get('action') for trade in trades]
+    return _TradeView(notionals, wins, pnls, timestamps, symbols, actions)
+
+class _TradeStore:
+    """Column-wise mirror of an append-only trading history, plus a timestamp-sorted index"""
+    
+    __slots__ = ('history', 'size', 'last_timestamp', 'notionals', 'wins', 'pnls', 'timestamps', 'symbols', 'actions',
+                 '_sorted_timestamps', '_sorted_positions')
+    
+    def __init__(self, history: List[Dict]):
+        self.history = history
+        self.size = 0
+        # Raw timestamp of the last synced trade, used to recognise the same history in a new list
+        self.last_timestamp = None
+        self.notionals, self.pnls, self.timestamps, self.symbols, self.actions = [], [], [], [], []
+        # Confidence is only ever compared against WIN_CONFIDENCE, so keep just the
+        # resulting flag at one byte per trade
+        self.wins = bytearray()
+        self._sorted_timestamps = []
+        self._sorted_positions = []
+    
+    def sync(self):
+        """Convert the trades appended since the last sync; each trade dict is read only once"""
+        if self.size == len(self.history):
+            return
+        
+        tail = _build_view(self.history[self.size:])
+        self.notionals += tail.notionals
+        self.wins += bytes(tail.wins)
+        self.pnls += tail.pnls
+        self.timestamps += tail.timestamps
+        self.symbols += tail.symbols
+        self.actions += tail.actions
+        
+        # New trades usually sort last; out-of-order ones are inserted in place
+        for i, timestamp in enumerate(tail.timestamps, self.size):
+            if timestamp is None:
+                continue
+            if not self._sorted_timestamps or timestamp >= self._sorted_timestamps[-1]:
+                self._sorted_timestamps.append(timestamp)
+                self._sorted_positions.append(i)
+            else:
+                at = bisect_right(self._sorted_timestamps, timestamp)
+                self._sorted_timestamps.insert(at, timestamp)
+                self._sorted_positions.insert(at, i)
+        self.size = len(self.history)
+        self.last_timestamp = self.history[-1].get('timestamp')
+    
+    def extends(self, history: List[Dict]) -> bool:
+        """True if history starts with the trades synced so far (same length prefix and last timestamp)"""
+        if self.size > len(history):
+            return False
+        return self.size == 0 or history[self.size - 1].get('timestamp') == self.last_timestamp
+    
+    def positions_since(self, cutoff: datetime) -> List[int]:
+        """History positions of trades with a datetime timestamp at or after cutoff, in history order"""
+        return sorted(self._sorted_positions[bisect_left(self._sorted_timestamps, cutoff):])
+    
+    def view(self, positions: Optional[List[int]] = None) -> _TradeView:
+        """Columns for the given history positions, or for the whole history"""
+        if positions is None:
+            n = self.size
+            return _TradeView(self.notionals[:n], self.wins[:n], self.pnls[:n],
+                              self.timestamps[:n], self.symbols[:n], self.actions[:n])
+        return _TradeView(
+            [self.notionals[i] for i in positions],
+            [self.wins[i] for i in positions],
+            [self.pnls[i] for i in positions],
+            [self.timestamps[i] for i in positions],
+            [self.symbols[i] for i in positions],
+            [self.actions[i] for i in positions]
+        )
+
 class ReportGeneratorNode:
     """Node for generating trading reports and analytics"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
+        
+        # Recently generated reports: (kind, history length, last timestamp, position count) -> (built_at, report)
+        self._report_cache = {}
+        self._report_cache_lock = threading.Lock()
+        
+        # Column store for the last history seen, extended as trades are appended
+        self._store = None
+        self._store_lock = threading.Lock()
+        
         logger.info("Report Generator Node initialized")
     
     def generate_weekly_report(self, trading_history: List[Dict], positions: Dict) -> Dict:
         """Generate weekly trading report"""
+        return self._memoized('weekly', self._build_weekly_report, trading_history, positions)
+    
+    def generate_monthly_report(self, trading_history: List[Dict], positions: Dict) -> Dict:
+        """Generate monthly trading report"""
+        return self._memoized('monthly', self._build_monthly_report, trading_history, positions)
+    
+    def generate_performance_summary(self, trading_history: List[Dict], positions: Dict) -> Dict:
+        """Generate overall performance summary"""
+        return self._memoized('summary', self._build_performance_summary, trading_history, positions)
+    
+    def _memoized(self, kind: str, build: Callable[[List[Dict], Dict], Dict],
+                  trading_history: List[Dict], positions: Dict) -> Dict:
+        """Reuse a recent report while no trade has been added and the position count is unchanged"""
+        last_timestamp = trading_history[-1].get('timestamp') if trading_history else None
+        key = (kind, len(trading_history), last_timestamp, len(positions))
+        
+        # Callers get shallow copies so they can't mutate the shared cache entry
+        entry = self._report_cache.get(key)
+        if entry and time.monotonic() - entry[0] < REPORT_CACHE_SECONDS:
+            return dict(entry[1])
+        
+        report = build(trading_history, positions)
+        if report:  # failures return {} and are retried on the next call
+            with self._report_cache_lock:
+                if len(self._report_cache) >= REPORT_CACHE_SIZE and key not in self._report_cache:
+                    del self._report_cache[next(iter(self._report_cache))]
+                self._report_cache.pop(key, None)
+                self._report_cache[key] = (time.monotonic(), report)
+        return dict(report)
+    
+    def _build_weekly_report(self, trading_history: List[Dict], positions: Dict) -> Dict:
+        """Compute the weekly trading report"""
         try:
+            # One clock reading for the cutoff and the report timestamps
+            now = datetime.now()
+            
             # Filter trades from last week
-            week_ago = datetime.now() - timedelta(days=7)
-            weekly_trades = [
-                trade for trade in trading_history 
-                if isinstance(trade.get('timestamp'), datetime) and trade['timestamp'] >= week_ago
-            ]
+            week_ago = now - timedelta(days=7)
+            weekly_trades, view = self._trades_since(trading_history, week_ago)
             
             # Calculate metrics
             total_trades = len(weekly_trades)
-            buy_trades = [t for t in weekly_trades if t.get('action') == 'BUY']
-            sell_trades = [t for t in weekly_trades if t.get('action') == 'SELL']
+            buy_count = view.actions.count('BUY')
+            sell_count = view.actions.count('SELL')
             
             # Calculate P&L (simplified - would need actual position tracking)
-            total_pnl = self._calculate_week_pnl(weekly_trades, positions)
+            total_pnl = self._calculate_week_pnl(view, positions)
             
             # Win rate calculation (based on confidence for now)
-            high_confidence_trades = [t for t in weekly_trades if t.get('confidence', 0) >= 7]
-            win_rate = (len(high_confidence_trades) / total_trades * 100) if total_trades > 0 else 0
+            profitable_trades = sum(view.wins)
+            win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
             
             # Most traded symbols
-            symbol_counts = {}
-            for trade in weekly_trades:
-                symbol = trade.get('symbol', 'Unknown')
-                symbol_counts[symbol] = symbol_counts.get(symbol, 0) + 1
-            
-            most_traded = sorted(symbol_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+            most_traded = Counter(view.symbols).most_common(5)
             
             # Performance by day
-            daily_performance = self._calculate_daily_performance(weekly_trades)
+            daily_performance = self._calculate_daily_performance(view)
             
             report = {
                 'period': 'weekly',
-                'start_date': week_ago.strftime('%Y-%m-%d'),
-                'end_date': datetime.now().strftime('%Y-%m-%d'),
+                'start_date': week_ago.date().isoformat(),
+                'end_date': now.date().isoformat(),
                 'total_trades': total_trades,
-                'buy_trades': len(buy_trades),
-                'sell_trades': len(sell_trades),
-                'profitable_trades': len(high_confidence_trades),
+                'buy_trades': buy_count,
+                'sell_trades': sell_count,
+                'profitable_trades': profitable_trades,
                 'win_rate': round(win_rate, 2),
                 'total_pnl': round(total_pnl, 2),
                 'most_traded_symbols': most_traded,
                 'daily_performance': daily_performance,
-                'trades': weekly_trades,
-                'generated_at': datetime.now().isoformat()
+                'trades_preview': weekly_trades[-REPORT_TRADE_PREVIEW:],
+                'generated_at': now.isoformat(timespec='seconds')
             }
             
             logger.info(f"Generated weekly report: {total_trades} trades, {win_rate:.1f}% win rate")
@@ -75,47 +224,47 @@ class ReportGeneratorNode:
             logger.error(f"Weekly report generation error: {str(e)}")
             return {}
     
-    def generate_monthly_report(self, trading_history: List[Dict], positions: Dict) -> Dict:
-        """Generate monthly trading report"""
+    def _build_monthly_report(self, trading_history: List[Dict], positions: Dict) -> Dict:
+        """Compute the monthly trading report"""
         try:
+            # One clock reading for the cutoff and the report timestamps
+            now = datetime.now()
+            
             # Filter trades from last month
-            month_ago = datetime.now() - timedelta(days=30)
-            monthly_trades = [
-                trade for trade in trading_history 
-                if isinstance(trade.get('timestamp'), datetime) and trade['timestamp'] >= month_ago
-            ]
+            month_ago = now - timedelta(days=30)
+            monthly_trades, view = self._trades_since(trading_history, month_ago)
             
             # Calculate comprehensive metrics
             total_trades = len(monthly_trades)
-            buy_trades = [t for t in monthly_trades if t.get('action') == 'BUY']
-            sell_trades = [t for t in monthly_trades if t.get('action') == 'SELL']
+            buy_count = view.actions.count('BUY')
+            sell_count = view.actions.count('SELL')
             
             # Calculate monthly P&L
-            total_pnl = self._calculate_month_pnl(monthly_trades, positions)
+            total_pnl = self._calculate_month_pnl(view, positions)
             
             # Advanced metrics
-            win_rate = self._calculate_actual_win_rate(monthly_trades)
-            avg_trade_size = self._calculate_avg_trade_size(monthly_trades)
-            largest_win = self._calculate_largest_win(monthly_trades)
-            largest_loss = self._calculate_largest_loss(monthly_trades)
+            win_rate = self._calculate_actual_win_rate(view)
+            avg_trade_size = self._calculate_avg_trade_size(view)
+            largest_win = self._calculate_largest_win(view)
+            largest_loss = self._calculate_largest_loss(view)
             
             # Risk metrics
-            max_drawdown = self._calculate_max_drawdown(monthly_trades)
-            sharpe_ratio = self._calculate_sharpe_ratio(monthly_trades)
+            max_drawdown = self._calculate_max_drawdown(view)
+            sharpe_ratio = self._calculate_sharpe_ratio(view)
             
             # Symbol analysis
-            symbol_performance = self._analyze_symbol_performance(monthly_trades)
+            symbol_performance = self._analyze_symbol_performance(view)
             
             # Weekly breakdown
-            weekly_breakdown = self._calculate_weekly_breakdown(monthly_trades)
+            weekly_breakdown = self._calculate_weekly_breakdown(view)
             
             report = {
                 'period': 'monthly',
-                'start_date': month_ago.strftime('%Y-%m-%d'),
-                'end_date': datetime.now().strftime('%Y-%m-%d'),
+                'start_date': month_ago.date().isoformat(),
+                'end_date': now.date().isoformat(),
                 'total_trades': total_trades,
-                'buy_trades': len(buy_trades),
-                'sell_trades': len(sell_trades),
+                'buy_trades': buy_count,
+                'sell_trades': sell_count,
                 'win_rate': round(win_rate, 2),
                 'total_pnl': round(total_pnl, 2),
                 'avg_trade_size': round(avg_trade_size, 2),
@@ -125,8 +274,8 @@ class ReportGeneratorNode:
                 'sharpe_ratio': round(sharpe_ratio, 3),
                 'symbol_performance': symbol_performance,
                 'weekly_breakdown': weekly_breakdown,
-                'trades': monthly_trades,
-                'generated_at': datetime.now().isoformat()
+                'trades_preview': monthly_trades[-REPORT_TRADE_PREVIEW:],
+                'generated_at': now.isoformat(timespec='seconds')
             }
             
             logger.info(f"Generated monthly report: {total_trades} trades, {win_rate:.1f}% win rate")
@@ -136,8 +285,8 @@ class ReportGeneratorNode:
             logger.error(f"Monthly report generation error: {str(e)}")
             return {}
     
-    def generate_performance_summary(self, trading_history: List[Dict], positions: Dict) -> Dict:
-        """Generate overall performance summary"""
+    def _build_performance_summary(self, trading_history: List[Dict], positions: Dict) -> Dict:
+        """Compute the overall performance summary"""
         try:
             if not trading_history:
                 return {
@@ -147,19 +296,18 @@ class ReportGeneratorNode:
                     'active_positions': 0
                 }
             
+            now = datetime.now()
             total_trades = len(trading_history)
-            total_pnl = self._calculate_total_pnl(trading_history, positions)
-            win_rate = self._calculate_actual_win_rate(trading_history)
+            view = self._history_view(trading_history)
+            total_pnl = self._calculate_total_pnl(view, positions)
+            win_rate = self._calculate_actual_win_rate(view)
             active_positions = len(positions)
             
             # Recent performance (last 7 days)
-            week_ago = datetime.now() - timedelta(days=7)
-            recent_trades = [
-                t for t in trading_history 
-                if isinstance(t.get('timestamp'), datetime) and t['timestamp'] >= week_ago
-            ]
+            week_ago = now - timedelta(days=7)
+            recent_trades, recent_view = self._trades_since(trading_history, week_ago)
             
-            recent_pnl = self._calculate_week_pnl(recent_trades, positions)
+            recent_pnl = self._calculate_week_pnl(recent_view, positions)
             
             return {
                 'total_trades': total_trades,
@@ -168,310 +316,171 @@ class ReportGeneratorNode:
                 'active_positions': active_positions,
                 'recent_trades': len(recent_trades),
                 'recent_pnl': round(recent_pnl, 2),
-                'last_updated': datetime.now().isoformat()
+                'last_updated': now.isoformat(timespec='seconds')
             }
             
         except Exception as e:
             logger.error(f"Performance summary error: {str(e)}")
             return {}
     
-    def _calculate_week_pnl(self, trades: List[Dict], positions: Dict) -> float:
-        """Calculate P&L for weekly trades (simplified)"""
-        try:
-            # This is a simplified calculation
-            # In a real implementation, you'd track actual entry/exit prices
-            pnl = 0
-            
-            for trade in trades:
-                confidence = trade.get('confidence', 5)
-                price = trade.get('price', 0)
-                quantity = trade.get('quantity', 0)
-                
-                # Estimate P&L based on confidence (mock calculation)
-                if confidence >= 7:  # High confidence = profitable
-                    pnl += (price * quantity * 0.02)  # 2% gain estimate
-                else:  # Low confidence = loss
-                    pnl -= (price * quantity * 0.01)  # 1% loss estimate
-            
-            return pnl
-            
-        except Exception as e:
-            logger.error(f"Week P&L calculation error: {str(e)}")
-            return 0.0
+    def _trades_since(self, trading_history: List[Dict], cutoff: datetime) -> Tuple[List[Dict], _TradeView]:
+        """Trades with a datetime timestamp at or after cutoff, in history order, and their columns"""
+        with self._store_lock:
+            store = self._sync_store(trading_history)
+            positions = store.positions_since(cutoff)
+            return [trading_history[i] for i in positions], store.view(positions)
+    
+    def _history_view(self, trading_history: List[Dict]) -> _TradeView:
+        """Columns for the whole trading history"""
+        with self._store_lock:
+            return self._sync_store(trading_history).view()
+    
+    def _sync_store(self, trading_history: List[Dict]) -> _TradeStore:
+        """The column store for this history, caught up with any appended trades (lock held)"""
+        store = self._store
+        if store is None or not store.extends(trading_history):
+            store = self._store = _TradeStore(trading_history)
+        # Callers may pass a fresh copy of the same history each time
+        store.history = trading_history
+        store.sync()
+        return store
     
-    def _calculate_month_pnl(self, trades: List[Dict], positions: Dict) -> float:
-        """Calculate P&L for monthly trades"""
-        # Similar to weekly but potentially more accurate with more data
-        return self._calculate_week_pnl(trades, positions)
+    def _calculate_week_pnl(self, view: _TradeView, positions: Dict) -> float:
+        """Calculate P&L for weekly trades (simplified)"""
+        # This is a simplified calculation
+        # In a real implementation, you'd track actual entry/exit prices
+        # Estimate P&L based on confidence (mock calculation)
+        return sum(view.pnls)
     
-    def _calculate_total_pnl(self, trades: List[Dict], positions: Dict) -> float:
-        """Calculate total P&L"""
-        return self._calculate_week_pnl(trades, positions)
+    # Monthly and total P&L use the same estimate as weekly
+    _calculate_month_pnl = _calculate_week_pnl
+    _calculate_total_pnl = _calculate_week_pnl
     
-    def _calculate_actual_win_rate(self, trades: List[Dict]) -> float:
+    def _calculate_actual_win_rate(self, view: _TradeView) -> float:
         """Calculate win rate based on confidence scores"""
-        try:
-            if not trades:
-                return 0.0
-            
-            # Use confidence as proxy for success
-            successful_trades = [t for t in trades if t.get('confidence', 0) >= 7]
-            return (len(successful_trades) / len(trades)) * 100
-            
-        except Exception as e:
-            logger.error(f"Win rate calculation error: {str(e)}")
+        if not view.wins:
             return 0.0
+        
+        # Use confidence as proxy for success
+        return (sum(view.wins) / len(view.wins)) * 100
     
-    def _calculate_avg_trade_size(self, trades: List[Dict]) -> float:
+    def _calculate_avg_trade_size(self, view: _TradeView) -> float:
         """Calculate average trade size"""
-        try:
-            if not trades:
-                return 0.0
-            
-            total_value = sum(
-                trade.get('price', 0) * trade.get('quantity', 0) 
-                for trade in trades
-            )
-            
-            return total_value / len(trades)
-            
-        except Exception as e:
-            logger.error(f"Average trade size calculation error: {str(e)}")
+        if not view.notionals:
             return 0.0
+        
+        return sum(view.notionals) / len(view.notionals)
     
-    def _calculate_largest_win(self, trades: List[Dict]) -> float:
+    def _calculate_largest_win(self, view: _TradeView) -> float:
         """Calculate largest winning trade"""
-        try:
-            wins = []
-            for trade in trades:
-                if trade.get('confidence', 0) >= 7:  # Assume high confidence = win
-                    value = trade.get('price', 0) * trade.get('quantity', 0)
-                    wins.append(value * 0.02)  # 2% gain estimate
-            
-            return max(wins) if wins else 0.0
-            
-        except Exception as e:
-            logger.error(f"Largest win calculation error: {str(e)}")
-            return 0.0
+        # Assume high confidence = win; the largest notional gives the largest 2% gain
+        largest = max((value for value, win in zip(view.notionals, view.wins) if win), default=None)
+        return largest * WIN_RETURN if largest is not None else 0.0
     
-    def _calculate_largest_loss(self, trades: List[Dict]) -> float:
+    def _calculate_largest_loss(self, view: _TradeView) -> float:
         """Calculate largest losing trade"""
-        try:
-            losses = []
-            for trade in trades:
-                if trade.get('confidence', 0) < 7:  # Assume low confidence = loss
-                    value = trade.get('price', 0) * trade.get('quantity', 0)
-                    losses.append(value * 0.01)  # 1% loss estimate
-            
-            return max(losses) if losses else 0.0
-            
-        except Exception as e:
-            logger.error(f"Largest loss calculation error: {str(e)}")
-            return 0.0
+        # Assume low confidence = loss, reported as a positive 1% of notional
+        largest = max((value for value, win in zip(view.notionals, view.wins) if not win), default=None)
+        return largest * -LOSS_RETURN if largest is not None else 0.0
     
-    def _calculate_max_drawdown(self, trades: List[Dict]) -> float:
+    def _calculate_max_drawdown(self, view: _TradeView) -> float:
         """Calculate maximum drawdown (simplified)"""
-        try:
-            # Simplified drawdown calculation
-            # In reality, this would require continuous portfolio value tracking
-            cumulative_pnl = 0
-            peak = 0
-            max_drawdown = 0
-            
-            for trade in trades:
-                confidence = trade.get('confidence', 5)
-                value = trade.get('price', 0) * trade.get('quantity', 0)
-                
-                # Estimate trade P&L
-                if confidence >= 7:
-                    cumulative_pnl += value * 0.02
-                else:
-                    cumulative_pnl -= value * 0.01
-                
-                # Update peak
-                if cumulative_pnl > peak:
-                    peak = cumulative_pnl
-                
-                # Calculate drawdown
-                drawdown = peak - cumulative_pnl
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-            
-            return max_drawdown
-            
-        except Exception as e:
-            logger.error(f"Max drawdown calculation error: {str(e)}")
-            return 0.0
+        # Simplified drawdown calculation
+        # In reality, this would require continuous portfolio value tracking
+        cumulative = list(accumulate(view.pnls))
+        peaks = accumulate(cumulative, max, initial=0)
+        next(peaks)  # the starting zero peak precedes the first trade
+        return max((peak - value for peak, value in zip(peaks, cumulative)), default=0)
     
-    def _calculate_sharpe_ratio(self, trades: List[Dict]) -> float:
+    def _calculate_sharpe_ratio(self, view: _TradeView) -> float:
         """Calculate Sharpe ratio (simplified)"""
-        try:
-            if len(trades) < 10:  # Need sufficient data
-                return 0.0
-            
-            # Calculate daily returns (estimated)
-            returns = []
-            for trade in trades:
-                confidence = trade.get('confidence', 5)
-                if confidence >= 7:
-                    returns.append(0.02)  # 2% return
-                else:
-                    returns.append(-0.01)  # -1% return
-            
-            if not returns:
-                return 0.0
-            
-            avg_return = sum(returns) / len(returns)
-            
-            # Calculate standard deviation
-            variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
-            std_dev = variance ** 0.5
-            
-            if std_dev == 0:
-                return 0.0
-            
-            # Annualized Sharpe ratio (assuming 252 trading days)
-            sharpe = (avg_return * 252) / (std_dev * (252 ** 0.5))
-            
-            return sharpe
-            
-        except Exception as e:
-            logger.error(f"Sharpe ratio calculation error: {str(e)}")
+        if len(view.wins) < 10:  # Need sufficient data
+            return 0.0
+        
+        # Each trade returns WIN_RETURN or LOSS_RETURN, so mean and standard
+        # deviation follow from the win fraction alone
+        p = sum(view.wins) / len(view.wins)
+        avg_return = LOSS_RETURN + p * (WIN_RETURN - LOSS_RETURN)
+        std_dev = (p * (1 - p)) ** 0.5 * (WIN_RETURN - LOSS_RETURN)
+        
+        if std_dev == 0:
             return 0.0
+        
+        # Annualized Sharpe ratio (assuming 252 trading days)
+        sharpe = (avg_return * 252) / (std_dev * (252 ** 0.5))
+        
+        return sharpe
     
-    def _analyze_symbol_performance(self, trades: List[Dict]) -> List[Dict]:
+    def _analyze_symbol_performance(self, view: _TradeView) -> List[Dict]:
         """Analyze performance by symbol"""
-        try:
-            symbol_stats = {}
-            
-            for trade in trades:
-                symbol = trade.get('symbol', 'Unknown')
-                confidence = trade.get('confidence', 5)
-                value = trade.get('price', 0) * trade.get('quantity', 0)
-                
-                if symbol not in symbol_stats:
-                    symbol_stats[symbol] = {
-                        'trades': 0,
-                        'total_value': 0,
-                        'wins': 0,
-                        'losses': 0,
-                        'pnl': 0
-                    }
-                
-                stats = symbol_stats[symbol]
-                stats['trades'] += 1
-                stats['total_value'] += value
-                
-                if confidence >= 7:
-                    stats['wins'] += 1
-                    stats['pnl'] += value * 0.02
-                else:
-                    stats['losses'] += 1
-                    stats['pnl'] -= value * 0.01
-            
-            # Convert to list and add calculated fields
-            performance = []
-            for symbol, stats in symbol_stats.items():
-                win_rate = (stats['wins'] / stats['trades']) * 100 if stats['trades'] > 0 else 0
-                avg_trade_size = stats['total_value'] / stats['trades'] if stats['trades'] > 0 else 0
-                
-                performance.append({
-                    'symbol': symbol,
-                    'trades': stats['trades'],
-                    'win_rate': round(win_rate, 1),
-                    'total_pnl': round(stats['pnl'], 2),
-                    'avg_trade_size': round(avg_trade_size, 2)
-                })
-            
-            # Sort by total P&L
-            performance.sort(key=lambda x: x['total_pnl'], reverse=True)
-            
-            return performance[:10]  # Top 10
-            
-        except Exception as e:
-            logger.error(f"Symbol performance analysis error: {str(e)}")
-            return []
+        # One accumulator per symbol: [trades, total_value, wins, pnl]
+        symbol_stats = {}
+        
+        for symbol, value, win, pnl in zip(view.symbols, view.notionals, view.wins, view.pnls):
+            stats = symbol_stats.get(symbol)
+            if stats is None:
+                stats = symbol_stats[symbol] = [0, 0, 0, 0]
+            stats[0] += 1
+            stats[1] += value
+            stats[2] += win
+            stats[3] += pnl
+        
+        # Convert to list and add calculated fields
+        performance = [
+            {
+                'symbol': symbol,
+                'trades': trades,
+                'win_rate': round((wins / trades) * 100, 1),
+                'total_pnl': round(pnl, 2),
+                'avg_trade_size': round(total_value / trades, 2)
+            }
+            for symbol, (trades, total_value, wins, pnl) in symbol_stats.items()
+        ]
+        
+        # Top 10 by total P&L
+        return heapq.nlargest(10, performance, key=itemgetter('total_pnl'))
     
-    def _calculate_daily_performance(self, trades: List[Dict]) -> Dict:
+    def _calculate_daily_performance(self, view: _TradeView) -> Dict:
         """Calculate performance by day of week"""
-        try:
-            daily_stats = {
-                'Monday': {'trades': 0, 'pnl': 0},
-                'Tuesday': {'trades': 0, 'pnl': 0},
-                'Wednesday': {'trades': 0, 'pnl': 0},
-                'Thursday': {'trades': 0, 'pnl': 0},
-                'Friday': {'trades': 0, 'pnl': 0}
-            }
-            
-            for trade in trades:
-                timestamp = trade.get('timestamp')
-                if not isinstance(timestamp, datetime):
-                    continue
-                
-                day_name = timestamp.strftime('%A')
-                if day_name in daily_stats:
-                    confidence = trade.get('confidence', 5)
-                    value = trade.get('price', 0) * trade.get('quantity', 0)
-                    
-                    daily_stats[day_name]['trades'] += 1
-                    
-                    if confidence >= 7:
-                        daily_stats[day_name]['pnl'] += value * 0.02
-                    else:
-                        daily_stats[day_name]['pnl'] -= value * 0.01
-            
-            # Round P&L values
-            for day in daily_stats:
-                daily_stats[day]['pnl'] = round(daily_stats[day]['pnl'], 2)
-            
-            return daily_stats
-            
-        except Exception as e:
-            logger.error(f"Daily performance calculation error: {str(e)}")
-            return {}
+        # Accumulate by weekday index (Monday = 0); weekend trades are ignored
+        trades = [0] * len(WEEKDAY_NAMES)
+        pnls = [0] * len(WEEKDAY_NAMES)
+        
+        for timestamp, pnl in zip(view.timestamps, view.pnls):
+            if timestamp is None:
+                continue
+            
+            weekday = timestamp.weekday()
+            if weekday < len(WEEKDAY_NAMES):
+                trades[weekday] += 1
+                pnls[weekday] += pnl
+        
+        # Round P&L values
+        return {
+            day: {'trades': trades[i], 'pnl': round(pnls[i], 2)}
+            for i, day in enumerate(WEEKDAY_NAMES)
+        }
     
-    def _calculate_weekly_breakdown(self, trades: List[Dict]) -> List[Dict]:
+    def _calculate_weekly_breakdown(self, view: _TradeView) -> List[Dict]:
         """Calculate weekly breakdown for monthly report"""
-        try:
-            # Group trades by week
-            weekly_data = {}
-            
-            for trade in trades:
-                timestamp = trade.get('timestamp')
-                if not isinstance(timestamp, datetime):
-                    continue
-                
-                # Get week start (Monday)
-                week_start = timestamp - timedelta(days=timestamp.weekday())
-                week_key = week_start.strftime('%Y-%m-%d')
-                
-                if week_key not in weekly_data:
-                    weekly_data[week_key] = {
-                        'week_start': week_key,
-                        'trades': 0,
-                        'pnl': 0
-                    }
-                
-                confidence = trade.get('confidence', 5)
-                value = trade.get('price', 0) * trade.get('quantity', 0)
-                
-                weekly_data[week_key]['trades'] += 1
-                
-                if confidence >= 7:
-                    weekly_data[week_key]['pnl'] += value * 0.02
-                else:
-                    weekly_data[week_key]['pnl'] -= value * 0.01
-            
-            # Convert to list and sort
-            weekly_breakdown = list(weekly_data.values())
-            weekly_breakdown.sort(key=lambda x: x['week_start'])
-            
-            # Round P&L values
-            for week in weekly_breakdown:
-                week['pnl'] = round(week['pnl'], 2)
-            
-            return weekly_breakdown
-            
-        except Exception as e:
-            logger.error(f"Weekly breakdown calculation error: {str(e)}")
-            return []
+        # Group trades by the day ordinal of their week start (Monday)
+        weekly_trades = {}
+        weekly_pnl = {}
+        
+        for timestamp, pnl in zip(view.timestamps, view.pnls):
+            if timestamp is None:
+                continue
+            
+            week_key = timestamp.toordinal() - timestamp.weekday()
+            weekly_trades[week_key] = weekly_trades.get(week_key, 0) + 1
+            weekly_pnl[week_key] = weekly_pnl.get(week_key, 0) + pnl
+        
+        # Sort and format each week once, rounding P&L values
+        return [
+            {
+                'week_start': date.fromordinal(week_key).isoformat(),
+                'trades': weekly_trades[week_key],
+                'pnl': round(weekly_pnl[week_key], 2)
+            }
+            for week_key in sorted(weekly_trades)
+        ]
@@ -2,23 +2,154 @@
 Stock Selector Node - Technical analysis-based stock selection for trading
 """
 
+import heapq
 import logging
+import threading
+import time
+import orjson
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple
 import json
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from statistics import fmean
 
-from config import Config
+from config import get_config
 from utils.logger import setup_logger
+from utils.rate_limiter import ALPACA_LIMITER
 
 logger = setup_logger()
 
+# Per-endpoint response TTLs: snapshots move constantly, daily history once a day
+SNAPSHOT_CACHE_SECONDS = 5
+HISTORY_CACHE_SECONDS = 3600
+RESPONSE_CACHE_SIZE = 256
+
+# On a failed refresh, serve the last good response only while it is younger than this many TTLs
+STALE_CACHE_FACTOR = 3
+
+# Assembled market data batches are shared by calls within the same tick
+BATCH_CACHE_SECONDS = 5
+BATCH_CACHE_SIZE = 16
+
+# Stock scores keyed by every input they depend on, so entries never go stale
+SCORE_CACHE_SIZE = 512
+
+# Threads for the snapshots and history requests of each batch
+FETCH_WORKERS = 8
+
+# Alpaca caps the symbols per market data request; larger batches are split into chunks
+SYMBOLS_PER_REQUEST = 100
+
+@lru_cache(maxsize=8)
+def _history_window(today: date) -> Tuple[str, str]:
+    """ISO start/end for the 30-day historical bars request, computed once per day"""
+    # End at midnight so every request of the day shares one window of completed bars
+    end_time = datetime.combine(today, datetime.min.time())
+    start_time = end_time - timedelta(days=30)
+    return start_time.isoformat(), end_time.isoformat()
+
+def _close_column(bars: List[Dict]) -> Optional[List[float]]:
+    """Closing prices of a bar list as one float column, or None if any bar lacks a usable close"""
+    try:
+        # Alpaca v2 bars use the short key 'c'
+        return [float(bar['c'] if 'c' in bar else bar['close']) for bar in bars]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _technical_pattern_score(closes: List[float]) -> float:
+    """Trend, momentum and volatility score over the last 20 closes"""
+    score = 0.0
+    
+    # Moving average trend
+    recent_avg = fmean(closes[-5:])
+    older_avg = fmean(closes[-20:-15])
+    
+    if recent_avg > older_avg:
+        score += 10.0  # Uptrend bonus
+    else:
+        score -= 5.0   # Downtrend penalty
+    
+    # Price momentum
+    current_price = closes[-1]
+    week_ago_price = closes[-5] if len(closes) >= 5 else current_price
+    
+    momentum = (current_price - week_ago_price) / week_ago_price * 100
+    
+    if -2 <= momentum <= 8:  # Moderate positive momentum
+        score += 15.0
+    elif momentum > 8:  # Strong momentum but might be overbought
+        score += 5.0
+    elif momentum < -5:  # Strong negative momentum
+        score -= 10.0
+    
+    # Volatility check: sum squared daily returns in one pass, without a returns list
+    sum_sq = 0.0
+    prev = closes[0]
+    for price in closes[1:]:
+        ret = (price - prev) / prev
+        sum_sq += ret * ret
+        prev = price
+    
+    if len(closes) > 1:
+        volatility = (sum_sq / (len(closes) - 1)) ** 0.5
+        
+        if 0.01 <= volatility <= 0.04:  # Moderate volatility
+            score += 10.0
+        elif volatility > 0.06:  # High volatility
+            score -= 5.0
+    
+    return score
+
+def _volatility_score(closes: List[float]) -> float:
+    """Score the standard deviation of daily returns over the last 10 closes"""
+    returns = [(curr - prev) / prev for prev, curr in zip(closes, closes[1:])]
+    
+    if not returns:
+        return 0
+    
+    # Calculate standard deviation
+    avg_return = fmean(returns)
+    variance = fmean([(r - avg_return) ** 2 for r in returns])
+    volatility = variance ** 0.5
+    
+    # Optimal volatility range for trading
+    if 0.015 <= volatility <= 0.035:  # 1.5% to 3.5% daily volatility
+        return 15.0
+    elif 0.01 <= volatility < 0.015 or 0.035 < volatility <= 0.05:
+        return 8.0
+    elif volatility > 0.08:  # Very high volatility
+        return -10.0
+    
+    return 0.0
+
 class StockSelectorNode:
     """Node for intelligent stock selection using technical analysis"""
     
+    # Sector preference points; unknown sectors get DEFAULT_SECTOR_SCORE
+    SECTOR_SCORES = {
+        'XLK': 5.0,   # Tech - moderate preference
+        'XLF': 8.0,   # Finance - high preference for diversification
+        'XLV': 10.0,  # Healthcare - very high preference (defensive)
+        'XLY': 6.0,   # Consumer Discretionary - moderate
+        'XLP': 9.0,   # Consumer Staples - high preference (defensive)
+        'XLI': 7.0,   # Industrial - moderate preference
+        'XLE': 3.0,   # Energy - low preference (volatile)
+        'XLU': 8.0,   # Utilities/ETFs - high preference (stable)
+    }
+    DEFAULT_SECTOR_SCORE = 4.0
+    
+    # Time-of-day sector boosts
+    MORNING_SECTORS = frozenset({'XLK', 'XLY'})
+    AFTERNOON_SECTORS = frozenset({'XLV', 'XLP', 'XLU'})
+    
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.alpaca_headers = {
             'APCA-API-KEY-ID': self.config.ALPACA_API_KEY,
             'APCA-API-SECRET-KEY': self.config.ALPACA_SECRET_KEY,
@@ -54,6 +185,31 @@ class StockSelectorNode:
             'XOM': 'XLE', 'CVX': 'XLE', 'COP': 'XLE'
         }
         
+        # Keep-alive connection pool for the Alpaca data API
+        self.session = requests.Session()
+        self.session.headers.update(self.alpaca_headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504],
+                              raise_on_status=False)
+        ))
+        
+        # Runs the per-chunk snapshots and historical-bars requests concurrently
+        self._fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="selector-fetch")
+        
+        # Alpaca responses: (url, symbols[, day]) -> (fetched_at, payload)
+        self._response_cache = {}
+        self._response_cache_lock = threading.Lock()
+        
+        # Market data batches: tuple(symbols) -> (fetched_at, market_data)
+        self._batch_cache = {}
+        self._batch_cache_lock = threading.Lock()
+        
+        # Stock scores: (symbol, hour, price, volume, closes) -> score
+        self._score_cache = {}
+        self._score_cache_lock = threading.Lock()
+        
         # Trade history for learning
         self.trade_history = []
         
@@ -74,6 +230,7 @@ class StockSelectorNode:
             # ETFs for diversification
             'SPY', 'QQQ', 'IWM', 'VTI'
         ]
+        self._universe_set = set(self.stock_universe)
         
         logger.info("Stock Selector Node initialized")
     
@@ -97,10 +254,11 @@ class StockSelectorNode:
                 return self._get_diversified_fallback_selection(max_stocks, sector_weights, time_factor)
             
             # 4. Score each stock with enhanced criteria
+            base_scores = self._score_batch(stock_data)
             scored_stocks = []
             for symbol, data in stock_data.items():
                 try:
-                    base_score = self._calculate_stock_score(symbol, data)
+                    base_score = base_scores[symbol]
                     
                     # Apply sector weighting
                     sector = self.stock_sectors.get(symbol)
@@ -175,58 +333,85 @@ class StockSelectorNode:
             return self._get_diversified_fallback_selection(max_stocks, {}, 1.0)
     
     def _get_market_data_batch(self, symbols: List[str]) -> Dict:
+        """Get market data for multiple symbols, reusing a batch assembled within the last few seconds"""
+        key = tuple(symbols)
+        entry = self._batch_cache.get(key)
+        if entry and time.monotonic() - entry[0] < BATCH_CACHE_SECONDS:
+            return dict(entry[1])
+        
+        market_data = self._fetch_market_data_batch(symbols)
+        if market_data:
+            with self._batch_cache_lock:
+                if len(self._batch_cache) >= BATCH_CACHE_SIZE and key not in self._batch_cache:
+                    del self._batch_cache[next(iter(self._batch_cache))]
+                self._batch_cache.pop(key, None)
+                self._batch_cache[key] = (time.monotonic(), market_data)
+        return dict(market_data)
+    
+    def _fetch_market_data_batch(self, symbols: List[str]) -> Dict:
         """Get market data for multiple symbols efficiently"""
         try:
             market_data = {}
             
-            # Get quotes for all symbols
-            symbols_str = ','.join(symbols)
-            url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/quotes/latest"
-            params = {'symbols': symbols_str}
-            
-            response = requests.get(url, headers=self.alpaca_headers, params=params)
-            
-            if response.status_code == 200:
-                quotes_data = response.json().get('quotes', {})
-                
-                # Get bars for technical analysis
-                bars_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/bars/latest"
-                bars_response = requests.get(bars_url, headers=self.alpaca_headers, params=params)
-                bars_data = {}
-                
-                if bars_response.status_code == 200:
-                    bars_data = bars_response.json().get('bars', {})
-                
-                # Get historical bars for trend analysis
-                end_time = datetime.now()
-                start_time = end_time - timedelta(days=30)
-                
+            # Historical bars window for trend analysis
+            today = date.today()
+            start_iso, end_iso = _history_window(today)
+            
+            # Each chunk gets one snapshots request (latest quote and daily bar per symbol) and
+            # one historical bars request, all in flight at once. Daily history only changes
+            # once a day, so its cache key ignores the exact window.
+            url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/snapshots"
+            hist_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/bars"
+            snapshot_futures = []
+            hist_futures = []
+            
+            for i in range(0, len(symbols), SYMBOLS_PER_REQUEST):
+                chunk = symbols[i:i + SYMBOLS_PER_REQUEST]
+                symbols_str = ','.join(chunk)
+                # Multi-symbol limit counts bars across all symbols, so scale it; pages are followed
                 hist_params = {
                     'symbols': symbols_str,
-                    'start': start_time.isoformat(),
-                    'end': end_time.isoformat(),
+                    'start': start_iso,
+                    'end': end_iso,
                     'timeframe': '1Day',
-                    'limit': 30
+                    'limit': min(10000, 30 * len(chunk))
                 }
                 
-                hist_url = f"{self.config.ALPACA_DATA_URL}/v2/stocks/bars"
-                hist_response = requests.get(hist_url, headers=self.alpaca_headers, params=hist_params)
+                snapshot_futures.append(self._fetch_pool.submit(
+                    self._cached_get, url, {'symbols': symbols_str}, (url, symbols_str), SNAPSHOT_CACHE_SECONDS
+                ))
+                hist_futures.append(self._fetch_pool.submit(
+                    self._cached_get, hist_url, hist_params, (hist_url, symbols_str, today), HISTORY_CACHE_SECONDS
+                ))
+            
+            # Merge the per-chunk snapshots; a failed chunk only drops its own symbols
+            snapshots = {}
+            for future in snapshot_futures:
+                payload = future.result()
+                if payload is not None:
+                    snapshots.update(payload)
+            
+            if snapshots:
+                # Get historical bars for trend analysis
                 hist_data = {}
-                
-                if hist_response.status_code == 200:
-                    hist_data = hist_response.json().get('bars', {})
+                for future in hist_futures:
+                    payload = future.result()
+                    if payload is not None:
+                        hist_data.update(payload.get('bars', {}))
                 
                 # Combine all data
                 for symbol in symbols:
-                    if symbol in quotes_data:
-                        quote = quotes_data[symbol]
-                        bar = bars_data.get(symbol, {})
+                    snapshot = snapshots.get(symbol) or {}
+                    quote = snapshot.get('latestQuote')
+                    if quote is not None:
+                        bar = snapshot.get('dailyBar') or {}
                         hist_bars = hist_data.get(symbol, [])
+                        hist_closes = _close_column(hist_bars) if hist_bars else []
                         
                         market_data[symbol] = {
                             'quote': quote,
                             'latest_bar': bar,
-                            'historical_bars': hist_bars,
+                            'historical_closes': hist_closes,
                             'price': self._get_price_from_quote(quote),
                             'volume': bar.get('volume', 0)
                         }
@@ -237,6 +422,61 @@ class StockSelectorNode:
             logger.error(f"Batch market data error: {str(e)}")
             return {}
     
+    def _alpaca_get(self, url: str, params: Dict) -> requests.Response:
+        """GET an Alpaca data endpoint within the account's request budget"""
+        ALPACA_LIMITER.acquire()
+        return self.session.get(url, params=params)
+    
+    def _cached_get(self, url: str, params: Dict, key: tuple, ttl: float) -> Optional[Dict]:
+        """GET an Alpaca JSON payload through a TTL cache, falling back to the last good copy on failure"""
+        entry = self._response_cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        
+        try:
+            payload = self._get_paged_payload(url, params)
+            if payload is not None:
+                with self._response_cache_lock:
+                    if len(self._response_cache) >= RESPONSE_CACHE_SIZE and key not in self._response_cache:
+                        del self._response_cache[next(iter(self._response_cache))]
+                    self._response_cache.pop(key, None)
+                    self._response_cache[key] = (time.monotonic(), payload)
+                return payload
+        except Exception as e:
+            logger.warning(f"Alpaca request error for {url}: {str(e)}")
+        
+        if entry:
+            age = time.monotonic() - entry[0]
+            if age < ttl * STALE_CACHE_FACTOR:
+                logger.warning(f"Serving stale cached data for {url} ({age:.0f}s old)")
+                return entry[1]
+        return None
+    
+    def _get_paged_payload(self, url: str, params: Dict) -> Optional[Dict]:
+        """GET an Alpaca JSON payload, folding any further pages of multi-symbol bars into the first"""
+        payload = None
+        page_params = dict(params)
+        
+        while True:
+            response = self._alpaca_get(url, page_params)
+            if response.status_code != 200:
+                logger.warning(f"Alpaca request failed for {url}: {response.status_code}")
+                return None
+            
+            page = orjson.loads(response.content)
+            if payload is None:
+                payload = page
+                if 'bars' in payload:
+                    payload['bars'] = payload['bars'] or {}
+            else:
+                for symbol, symbol_bars in (page.get('bars') or {}).items():
+                    payload['bars'].setdefault(symbol, []).extend(symbol_bars)
+            
+            page_token = page.get('next_page_token')
+            if not page_token:
+                return payload
+            page_params['page_token'] = page_token
+    
     def _get_time_factor(self, current_time) -> float:
         """Calculate time-based adjustment factor"""
         try:
@@ -282,10 +522,10 @@ class StockSelectorNode:
                         'end': end_date.strftime('%Y-%m-%d')
                     }
                     
-                    response = requests.get(url, headers=self.alpaca_headers, params=params)
+                    response = self._alpaca_get(url, params)
                     
                     if response.status_code == 200:
-                        data = response.json().get('bars', {}).get(etf_symbol, [])
+                        data = orjson.loads(response.content).get('bars', {}).get(etf_symbol, [])
                         if len(data) >= 2:
                             # Calculate 7-day return
                             latest_close = float(data[-1]['c'])
@@ -303,7 +543,7 @@ class StockSelectorNode:
             
             # Convert performance to weights (outperforming sectors get higher weights)
             if sector_performance:
-                avg_performance = sum(sector_performance.values()) / len(sector_performance)
+                avg_performance = fmean(sector_performance.values())
                 sector_weights = {}
                 
                 for etf, performance in sector_performance.items():
@@ -410,13 +650,13 @@ class StockSelectorNode:
                     'momentum_score': momentum_score
                 })
             
-            # Sort by combined score and return top selections
-            final_scores.sort(key=lambda x: x['combined_score'], reverse=True)
-            selected = [stock['symbol'] for stock in final_scores[:max_stocks]]
+            # Pick the top selections by combined score without sorting the rest
+            top_scores = heapq.nlargest(max_stocks, final_scores, key=itemgetter('combined_score'))
+            selected = [stock['symbol'] for stock in top_scores]
             
             # Log the reasoning
             logger.info("Technical momentum-enhanced selection:")
-            for i, stock in enumerate(final_scores[:max_stocks]):
+            for i, stock in enumerate(top_scores):
                 logger.info(f"#{i+1} {stock['symbol']}: combined={stock['combined_score']:.2f}, base={stock['base_score']:.2f}, momentum={stock['momentum_score']:.2f}")
             
             return selected
@@ -567,10 +807,30 @@ class StockSelectorNode:
         except Exception as e:
             logger.error(f"Sector diversification error: {str(e)}")
             # Return top stocks by score as fallback
-            scored_stocks.sort(key=lambda x: x['score'], reverse=True)
-            return [s['symbol'] for s in scored_stocks[:max_stocks]]
+            return [s['symbol'] for s in heapq.nlargest(max_stocks, scored_stocks, key=itemgetter('score'))]
     
-    def _calculate_stock_score(self, symbol: str, data: Dict) -> float:
+    def _score_batch(self, stock_data: Dict[str, Dict]) -> Dict[str, float]:
+        """Score a whole batch of symbols, reading the clock once and reusing scores of unchanged inputs"""
+        current_hour = datetime.now().hour
+        scores = {}
+        
+        for symbol, data in stock_data.items():
+            key = (symbol, current_hour, data.get('price', 0), data.get('volume', 0),
+                   tuple((data.get('historical_closes') or [])[-20:]))
+            score = self._score_cache.get(key)
+            
+            if score is None:
+                score = self._calculate_stock_score(symbol, data, current_hour)
+                with self._score_cache_lock:
+                    if len(self._score_cache) >= SCORE_CACHE_SIZE and key not in self._score_cache:
+                        del self._score_cache[next(iter(self._score_cache))]
+                    self._score_cache[key] = score
+            
+            scores[symbol] = score
+        
+        return scores
+    
+    def _calculate_stock_score(self, symbol: str, data: Dict, current_hour: Optional[int] = None) -> float:
         """Calculate a composite score for stock selection"""
         try:
             score = 0.0
@@ -600,18 +860,23 @@ class StockSelectorNode:
             else:
                 score -= 10.0  # Low volume penalty
             
-            # Historical analysis
-            hist_bars = data.get('historical_bars', [])
-            if len(hist_bars) >= 20:
-                score += self._analyze_technical_patterns(hist_bars)
+            # Historical analysis over the close column built at ingest
+            closes = data.get('historical_closes') or []
+            if len(closes) >= 20:
+                try:
+                    score += _technical_pattern_score(closes[-20:])
+                except Exception as e:
+                    logger.error(f"Technical analysis error: {str(e)}")
             
             # Sector preferences
-            score += self._get_sector_preference_score(symbol)
+            score += self._get_sector_preference_score(symbol, current_hour)
             
             # Volatility analysis
-            if hist_bars:
-                volatility_score = self._calculate_volatility_score(hist_bars)
-                score += volatility_score
+            if len(closes) >= 10:
+                try:
+                    score += _volatility_score(closes[-10:])
+                except Exception as e:
+                    logger.error(f"Volatility score error: {str(e)}")
             
             return max(0, score)  # Ensure non-negative score
             
@@ -619,58 +884,7 @@ class StockSelectorNode:
             logger.error(f"Score calculation error for {symbol}: {str(e)}")
             return 0.0
     
-    def _analyze_technical_patterns(self, bars: List[Dict]) -> float:
-        """Analyze technical patterns for scoring"""
-        try:
-            if len(bars) < 20:
-                return 0
-            
-            score = 0.0
-            closes = [float(bar['close']) for bar in bars[-20:]]
-            
-            # Moving average trend
-            recent_avg = sum(closes[-5:]) / 5
-            older_avg = sum(closes[-20:-15]) / 5
-            
-            if recent_avg > older_avg:
-                score += 10.0  # Uptrend bonus
-            else:
-                score -= 5.0   # Downtrend penalty
-            
-            # Price momentum
-            current_price = closes[-1]
-            week_ago_price = closes[-5] if len(closes) >= 5 else current_price
-            
-            momentum = (current_price - week_ago_price) / week_ago_price * 100
-            
-            if -2 <= momentum <= 8:  # Moderate positive momentum
-                score += 15.0
-            elif momentum > 8:  # Strong momentum but might be overbought
-                score += 5.0
-            elif momentum < -5:  # Strong negative momentum
-                score -= 10.0
-            
-            # Volatility check
-            daily_returns = []
-            for i in range(1, len(closes)):
-                ret = (closes[i] - closes[i-1]) / closes[i-1]
-                daily_returns.append(ret)
-            
-            if daily_returns:
-                volatility = (sum(r*r for r in daily_returns) / len(daily_returns)) ** 0.5
-                
-                if 0.01 <= volatility <= 0.04:  # Moderate volatility
-                    score += 10.0
-                elif volatility > 0.06:  # High volatility
-                    score -= 5.0
-            
-            return score
-            
-        except Exception as e:
-            logger.error(f"Technical analysis error: {str(e)}")
-            return 0.0
-    
-    def _get_sector_preference_score(self, symbol: str) -> float:
+    def _get_sector_preference_score(self, symbol: str, current_hour: Optional[int] = None) -> float:
         """Give preference scores based on sector/stock type with diversity bonus"""
         base_score = 0.0
         
@@ -680,72 +894,20 @@ class StockSelectorNode:
         
         # Sector-based scoring with more variation
         sector = self.stock_sectors.get(symbol, 'OTHER')
+        base_score += self.SECTOR_SCORES.get(sector, self.DEFAULT_SECTOR_SCORE)
         
-        if sector == 'XLK':  # Tech - moderate preference
-            base_score += 5.0
-        elif sector == 'XLF':  # Finance - high preference for diversification  
-            base_score += 8.0
-        elif sector == 'XLV':  # Healthcare - very high preference (defensive)
-            base_score += 10.0
-        elif sector == 'XLY':  # Consumer Discretionary - moderate
-            base_score += 6.0
-        elif sector == 'XLP':  # Consumer Staples - high preference (defensive)
-            base_score += 9.0
-        elif sector == 'XLI':  # Industrial - moderate preference
-            base_score += 7.0
-        elif sector == 'XLE':  # Energy - low preference (volatile)
-            base_score += 3.0
-        elif sector == 'XLU':  # Utilities/ETFs - high preference (stable)
-            base_score += 8.0  
-        else:
-            base_score += 4.0  # Default for unknown sectors
-            
         # Time-based sector preferences to add more variation
-        current_hour = datetime.now().hour
+        if current_hour is None:
+            current_hour = datetime.now().hour
         if current_hour < 11:  # Morning boost for certain sectors
-            if sector in ['XLK', 'XLY']:
+            if sector in self.MORNING_SECTORS:
                 base_score += 3.0
         elif current_hour > 14:  # Afternoon boost for defensive sectors
-            if sector in ['XLV', 'XLP', 'XLU']:
+            if sector in self.AFTERNOON_SECTORS:
                 base_score += 4.0
                 
         return base_score
     
-    def _calculate_volatility_score(self, bars: List[Dict]) -> float:
-        """Calculate volatility-based score"""
-        try:
-            if len(bars) < 10:
-                return 0
-            
-            closes = [float(bar['close']) for bar in bars[-10:]]
-            returns = []
-            
-            for i in range(1, len(closes)):
-                ret = (closes[i] - closes[i-1]) / closes[i-1]
-                returns.append(ret)
-            
-            if not returns:
-                return 0
-            
-            # Calculate standard deviation
-            avg_return = sum(returns) / len(returns)
-            variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
-            volatility = variance ** 0.5
-            
-            # Optimal volatility range for trading
-            if 0.015 <= volatility <= 0.035:  # 1.5% to 3.5% daily volatility
-                return 15.0
-            elif 0.01 <= volatility < 0.015 or 0.035 < volatility <= 0.05:
-                return 8.0
-            elif volatility > 0.08:  # Very high volatility
-                return -10.0
-            
-            return 0.0
-            
-        except Exception as e:
-            logger.error(f"Volatility score error: {str(e)}")
-            return 0.0
-    
     def _get_price_from_quote(self, quote: Dict) -> float:
         """Extract price from quote data"""
         try:
@@ -778,14 +940,18 @@ class StockSelectorNode:
             
             sector_performance = {}
             
-            for sector, symbols in sectors.items():
-                sector_data = self._get_market_data_batch(symbols[:3])  # Limit for efficiency
+            # Fetch every sector's batch at once; results are read back in sector order
+            with ThreadPoolExecutor(max_workers=len(sectors)) as executor:
+                futures = {
+                    sector: executor.submit(self._get_market_data_batch, symbols[:3])  # Limit for efficiency
+                    for sector, symbols in sectors.items()
+                }
+            
+            for sector, future in futures.items():
+                sector_data = future.result()
                 
                 if sector_data:
-                    total_score = sum(
-                        self._calculate_stock_score(symbol, data) 
-                        for symbol, data in sector_data.items()
-                    )
+                    total_score = sum(self._score_batch(sector_data).values())
                     avg_score = total_score / len(sector_data) if sector_data else 0
                     
                     sector_performance[sector] = {
@@ -807,9 +973,11 @@ class StockSelectorNode:
             valid_symbols = [s.upper().strip() for s in new_symbols if s.strip().isalpha()]
             
             if valid_symbols:
-                self.stock_universe.extend(valid_symbols)
-                # Remove duplicates
-                self.stock_universe = list(set(self.stock_universe))
+                # Append only unseen symbols, keeping the universe in insertion order
+                for symbol in valid_symbols:
+                    if symbol not in self._universe_set:
+                        self._universe_set.add(symbol)
+                        self.stock_universe.append(symbol)
                 logger.info(f"Updated stock universe with {len(valid_symbols)} new symbols")
             else:
                 logger.warning("No valid symbols provided for universe update")
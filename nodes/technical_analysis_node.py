@@ -3,18 +3,164 @@ Technical Analysis Node - Rule-based trading decisions without external AI
 """
 
 import logging
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
-from config import Config
+from config import get_config
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Market sentiment summary; only the symbol list varies
+NEUTRAL_ANALYSIS_TEMPLATE = """
+Technical Market Analysis for {symbols}:
+
+Overall Sentiment: NEUTRAL
+- Market conditions appear balanced
+- Mixed technical signals across symbols
+- Recommend cautious position sizing
+
+Risk Level: MEDIUM
+- Standard market volatility
+- Normal trading volumes
+- No extreme technical conditions detected
+
+Strategy: Balanced approach with risk management
+"""
+
+# Portfolio advice: only the header varies, the recommendations are fixed text
+PORTFOLIO_ADVICE_HEADER = """
+Portfolio Technical Analysis:
+
+Total Portfolio Value: ${total_value:,.2f}
+Active Positions: {positions_count}
+"""
+
+PORTFOLIO_ADVICE_BODY = """
+Technical Recommendations:
+- Maintain diversification across sectors
+- Use position sizing based on volatility
+- Implement stop-loss orders for risk management
+- Monitor technical indicators for entry/exit signals
+
+Risk Management:
+- Keep individual positions under 5% of total portfolio
+- Use technical stops at 5-7% below entry
+- Take profits at 10-15% gains unless trend is very strong
+"""
+
+# Signals in evaluation order; bit i of _signal_mask's result selects entry i
+TECHNICAL_SIGNALS = (
+    ("BUY", 2, "Price above moving averages - uptrend"),
+    ("SELL", 2, "Price below moving averages - downtrend"),
+    ("BUY", 3, "RSI oversold - potential bounce"),
+    ("SELL", 3, "RSI overbought - potential pullback"),
+    ("BUY", 3, "Strong positive momentum"),
+    ("SELL", 3, "Strong negative momentum"),
+    ("BUY", 2, "Positive momentum"),
+    ("SELL", 2, "Negative momentum"),
+    ("BUY", 1, "Mild positive momentum"),
+    ("SELL", 1, "Mild negative momentum"),
+    ("SELL", 4, "Take profit - 10% gain achieved"),
+    ("SELL", 5, "Stop loss - 5% loss limit"),
+)
+
+def _signal_mask(current_price: float, price_change: float, ma_20: float, ma_50: float, rsi: float,
+                 has_position: bool, avg_entry: float, unrealized_pl: float) -> int:
+    """Evaluate the rule ladder on plain scalars, returning a bitmask into TECHNICAL_SIGNALS"""
+    mask = 0
+    
+    # Moving average signals
+    if current_price > ma_20 and ma_20 > ma_50:
+        mask |= 1 << 0
+    elif current_price < ma_20 and ma_20 < ma_50:
+        mask |= 1 << 1
+    
+    # RSI signals
+    if rsi < 30:
+        mask |= 1 << 2
+    elif rsi > 70:
+        mask |= 1 << 3
+    
+    # Price momentum signals - More sensitive
+    if price_change > 3:
+        mask |= 1 << 4
+    elif price_change < -3:
+        mask |= 1 << 5
+    elif price_change > 1:
+        mask |= 1 << 6
+    elif price_change < -1:
+        mask |= 1 << 7
+    elif price_change > 0.5:
+        mask |= 1 << 8
+    elif price_change < -0.5:
+        mask |= 1 << 9
+    
+    # Position management
+    if has_position:
+        # Take profit signal
+        if unrealized_pl > 0 and (current_price / avg_entry - 1) > 0.1:  # 10% profit
+            mask |= 1 << 10
+        
+        # Stop loss signal
+        elif unrealized_pl < 0 and (current_price / avg_entry - 1) < -0.05:  # 5% loss
+            mask |= 1 << 11
+    
+    return mask
+
+def _combine_signals(signals: tuple) -> Tuple[str, int, str]:
+    """Reduce fired signals to (action, confidence, reasoning)"""
+    action = "HOLD"
+    confidence = 5
+    reasoning = "Neutral market conditions"
+    
+    # Combine signals - Made more responsive
+    if signals:
+        # Single pass: accumulate strength and reasons per side
+        buy_strength = sell_strength = 0
+        buy_reasons = []
+        sell_reasons = []
+        for signal_action, strength, reason in signals:
+            if signal_action == "BUY":
+                buy_strength += strength
+                buy_reasons.append(reason)
+            else:
+                sell_strength += strength
+                sell_reasons.append(reason)
+        
+        # Lowered threshold from 3 to 2 for more active trading
+        if buy_strength > sell_strength and buy_strength >= 2:
+            action = "BUY"
+            confidence = min(10, buy_strength + 3)
+            reasoning = "; ".join(buy_reasons)
+        elif sell_strength > buy_strength and sell_strength >= 2:
+            action = "SELL"
+            confidence = min(10, sell_strength + 3)
+            reasoning = "; ".join(sell_reasons)
+        else:
+            action = "HOLD"
+            confidence = 5
+            reasoning = "Mixed signals - waiting for clearer trend"
+    
+    return action, confidence, reasoning
+
+# At most 2**len(TECHNICAL_SIGNALS) distinct masks, so the cache stays small
+@lru_cache(maxsize=None)
+def _decision_for_mask(mask: int) -> Tuple[str, int, str, tuple]:
+    """Resolve a signal mask to (action, confidence, reasoning, signals), memoized per mask"""
+    signals = tuple(signal for bit, signal in enumerate(TECHNICAL_SIGNALS) if mask >> bit & 1)
+    return _combine_signals(signals) + (signals,)
+
+@lru_cache(maxsize=32)
+def _neutral_sentiment_analysis(symbols: Tuple[str, ...]) -> str:
+    """Render the sentiment summary once per distinct symbol selection"""
+    return NEUTRAL_ANALYSIS_TEMPLATE.format(symbols=', '.join(symbols))
+
 class TechnicalAnalysisNode:
     """Node for technical analysis-based trading decisions"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         logger.info("Technical Analysis Node initialized (No external AI required)")
     
     def get_trading_decision(self, symbol: str, price_data: Dict, current_position: Optional[Dict]) -> Optional[Dict]:
@@ -49,89 +195,69 @@ class TechnicalAnalysisNode:
             # Debug logging to see actual data
             logger.info(f"DEBUG {symbol}: price=${current_price:.2f}, change={price_change:.2f}%, rsi={rsi:.1f}, ma20=${ma_20:.2f}, ma50=${ma_50:.2f}")
             
-            # Default decision
-            action = "HOLD"
-            confidence = 5
-            reasoning = "Neutral market conditions"
             quantity = 1
             
             # Technical analysis rules
-            signals = []
-            
-            # Moving average signals
-            if current_price > ma_20 and ma_20 > ma_50:
-                signals.append(("BUY", 2, "Price above moving averages - uptrend"))
-            elif current_price < ma_20 and ma_20 < ma_50:
-                signals.append(("SELL", 2, "Price below moving averages - downtrend"))
-            
-            # RSI signals
-            if rsi < 30:
-                signals.append(("BUY", 3, "RSI oversold - potential bounce"))
-            elif rsi > 70:
-                signals.append(("SELL", 3, "RSI overbought - potential pullback"))
-            
-            # Price momentum signals - More sensitive
-            if price_change > 3:
-                signals.append(("BUY", 3, "Strong positive momentum"))
-            elif price_change < -3:
-                signals.append(("SELL", 3, "Strong negative momentum"))
-            elif price_change > 1:
-                signals.append(("BUY", 2, "Positive momentum"))
-            elif price_change < -1:
-                signals.append(("SELL", 2, "Negative momentum"))
-            elif price_change > 0.5:
-                signals.append(("BUY", 1, "Mild positive momentum"))
-            elif price_change < -0.5:
-                signals.append(("SELL", 1, "Mild negative momentum"))
-            
-            # Position management
-            if current_position:
-                qty = float(current_position.get('qty', 0))
+            has_position = bool(current_position)
+            avg_entry = unrealized_pl = 0.0
+            if has_position:
                 avg_entry = float(current_position.get('avg_entry_price', 0))
                 unrealized_pl = float(current_position.get('unrealized_pl', 0))
-                
-                # Take profit signal
-                if unrealized_pl > 0 and (current_price / avg_entry - 1) > 0.1:  # 10% profit
-                    signals.append(("SELL", 4, "Take profit - 10% gain achieved"))
-                
-                # Stop loss signal
-                elif unrealized_pl < 0 and (current_price / avg_entry - 1) < -0.05:  # 5% loss
-                    signals.append(("SELL", 5, "Stop loss - 5% loss limit"))
             
-            # Combine signals - Made more responsive
-            if signals:
-                buy_signals = [s for s in signals if s[0] == "BUY"]
-                sell_signals = [s for s in signals if s[0] == "SELL"]
-                
-                buy_strength = sum(s[1] for s in buy_signals)
-                sell_strength = sum(s[1] for s in sell_signals)
-                
-                # Lowered threshold from 3 to 2 for more active trading
-                if buy_strength > sell_strength and buy_strength >= 2:
-                    action = "BUY"
-                    confidence = min(10, buy_strength + 3)
-                    reasoning = "; ".join([s[2] for s in buy_signals])
-                elif sell_strength > buy_strength and sell_strength >= 2:
-                    action = "SELL"
-                    confidence = min(10, sell_strength + 3)
-                    reasoning = "; ".join([s[2] for s in sell_signals])
-                else:
-                    action = "HOLD"
-                    confidence = 5
-                    reasoning = "Mixed signals - waiting for clearer trend"
+            mask = _signal_mask(current_price, price_change, ma_20, ma_50, rsi,
+                                has_position, avg_entry, unrealized_pl)
+            action, confidence, reasoning, signals = _decision_for_mask(mask)
             
             return {
                 'action': action,
                 'confidence': confidence,
                 'reasoning': reasoning,
                 'quantity': quantity,
-                'technical_signals': signals
+                'technical_signals': list(signals)
             }
             
         except Exception as e:
             logger.error(f"Technical analysis error: {str(e)}")
             return None
     
+    def decide_batch(self, symbol_data: Dict[str, Tuple[Dict, Optional[Dict]]]) -> Dict[str, Dict]:
+        """Decide for many symbols at once from {symbol: (price_data, current_position)}"""
+        decisions = {}
+        
+        for symbol, (price_data, current_position) in symbol_data.items():
+            # A bad field only drops its own symbol from the batch
+            try:
+                current_price = price_data.get('current_price', 0)
+                has_position = bool(current_position)
+                avg_entry = unrealized_pl = 0.0
+                if has_position:
+                    avg_entry = float(current_position.get('avg_entry_price', 0))
+                    unrealized_pl = float(current_position.get('unrealized_pl', 0))
+                
+                mask = _signal_mask(
+                    current_price,
+                    price_data.get('price_change_percent', 0),
+                    price_data.get('ma_20', current_price),
+                    price_data.get('ma_50', current_price),
+                    price_data.get('rsi', 50),
+                    has_position, avg_entry, unrealized_pl
+                )
+            except Exception as e:
+                logger.error(f"Technical analysis error for {symbol}: {str(e)}")
+                continue
+            
+            action, confidence, reasoning, signals = _decision_for_mask(mask)
+            decisions[symbol] = {
+                'action': action,
+                'confidence': confidence,
+                'reasoning': reasoning,
+                'quantity': 1,
+                'technical_signals': list(signals)
+            }
+        
+        logger.info(f"Technical analysis batch decided {len(decisions)} of {len(symbol_data)} symbols")
+        return decisions
+    
     def analyze_market_sentiment(self, symbols: list) -> Optional[Dict]:
         """Analyze overall market sentiment using technical indicators"""
         try:
@@ -139,21 +265,7 @@ class TechnicalAnalysisNode:
             sentiment = "NEUTRAL"
             risk_level = "MEDIUM"
             
-            analysis = f"""
-Technical Market Analysis for {', '.join(symbols)}:
-
-Overall Sentiment: NEUTRAL
-- Market conditions appear balanced
-- Mixed technical signals across symbols
-- Recommend cautious position sizing
-
-Risk Level: MEDIUM
-- Standard market volatility
-- Normal trading volumes
-- No extreme technical conditions detected
-
-Strategy: Balanced approach with risk management
-"""
+            analysis = _neutral_sentiment_analysis(tuple(symbols))
             
             return {
                 'sentiment': sentiment,
@@ -175,23 +287,7 @@ Strategy: Balanced approach with risk management
             total_value = portfolio_data.get('total_value', 0)
             positions = portfolio_data.get('positions', [])
             
-            advice = f"""
-Portfolio Technical Analysis:
-
-Total Portfolio Value: ${total_value:,.2f}
-Active Positions: {len(positions)}
-
-Technical Recommendations:
-- Maintain diversification across sectors
-- Use position sizing based on volatility
-- Implement stop-loss orders for risk management
-- Monitor technical indicators for entry/exit signals
-
-Risk Management:
-- Keep individual positions under 5% of total portfolio
-- Use technical stops at 5-7% below entry
-- Take profits at 10-15% gains unless trend is very strong
-"""
+            advice = PORTFOLIO_ADVICE_HEADER.format(total_value=total_value, positions_count=len(positions)) + PORTFOLIO_ADVICE_BODY
             
             return advice
             
@@ -7,16 +7,36 @@ import requests
 from typing import Optional, Dict
 import json
 
-from config import Config
+from config import get_config
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Trade alert body, filled with str.format_map on a prepared dict per trade
+TRADE_ALERT_TEMPLATE = """
+{emoji} **TRADE ALERT**
+
+🏷️ Symbol: `{symbol}`
+🎯 Action: `{action}`
+📊 Quantity: `{quantity}` shares
+💰 Price: `${price:.2f}`
+🎚️ Confidence: `{confidence}/10`
+
+💭 **Reasoning:**
+{reasoning}
+
+⏰ {timestamp}
+"""
+
+ACTION_EMOJI = {'BUY': '📈', 'SELL': '📉'}
+SENTIMENT_EMOJI = {'BULLISH': '🐂', 'BEARISH': '🐻', 'NEUTRAL': '😐'}
+RISK_EMOJI = {'LOW': '🟢', 'MEDIUM': '🟡', 'HIGH': '🔴'}
+
 class TelegramNode:
     """Node for Telegram notifications"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.bot_token = self.config.TELEGRAM_BOT_TOKEN
         self.chat_id = self.config.TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
@@ -59,22 +79,16 @@ class TelegramNode:
                         confidence: int, reasoning: str) -> bool:
         """Send formatted trade alert"""
         try:
-            emoji = "📈" if action == "BUY" else "📉" if action == "SELL" else "⏸️"
-            
-            message = f"""
-{emoji} **TRADE ALERT**
-
-🏷️ Symbol: `{symbol}`
-🎯 Action: `{action}`
-📊 Quantity: `{quantity}` shares
-💰 Price: `${price:.2f}`
-🎚️ Confidence: `{confidence}/10`
-
-💭 **Reasoning:**
-{reasoning[:300]}{"..." if len(reasoning) > 300 else ""}
-
-⏰ {self._get_timestamp()}
-"""
+            message = TRADE_ALERT_TEMPLATE.format_map({
+                'emoji': ACTION_EMOJI.get(action, "⏸️"),
+                'symbol': symbol,
+                'action': action,
+                'quantity': quantity,
+                'price': price,
+                'confidence': confidence,
+                'reasoning': reasoning[:300] + "..." if len(reasoning) > 300 else reasoning,
+                'timestamp': self._get_timestamp()
+            })
             
             return self.send_message(message)
             
@@ -136,17 +150,8 @@ Please check the logs for more details.
             risk_level = analysis.get('risk_level', 'MEDIUM')
             analysis_text = analysis.get('analysis', '')
             
-            sentiment_emoji = {
-                'BULLISH': '🐂',
-                'BEARISH': '🐻',
-                'NEUTRAL': '😐'
-            }.get(sentiment, '😐')
-            
-            risk_emoji = {
-                'LOW': '🟢',
-                'MEDIUM': '🟡',
-                'HIGH': '🔴'
-            }.get(risk_level, '🟡')
+            sentiment_emoji = SENTIMENT_EMOJI.get(sentiment, '😐')
+            risk_emoji = RISK_EMOJI.get(risk_level, '🟡')
             
             message = f"""
 🔍 **MARKET ANALYSIS**
@@ -0,0 +1,36 @@
+"""
+Rate limiting utility for outbound API calls
+"""
+
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` calls per `per` seconds, with bursts up to `rate`"""
+    
+    def __init__(self, rate: int, per: float):
+        self.capacity = float(rate)
+        self.fill_rate = rate / per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.fill_rate
+            
+            time.sleep(wait)
+
+# Shared per process, since the quotas are per account / API key
+ALPACA_LIMITER = TokenBucket(200, 60)  # Alpaca: 200 requests per minute
+ALPHA_VANTAGE_LIMITER = TokenBucket(5, 60)  # Alpha Vantage free tier: 5 requests per minute
@@ -4,7 +4,7 @@ Task Scheduler for handling periodic trading bot tasks
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import threading
 import time
 
@@ -18,10 +18,14 @@ logger = setup_logger()
 class TaskScheduler:
     """Scheduler for periodic tasks like reports and maintenance"""
     
-    def __init__(self):
-        self.report_generator = ReportGeneratorNode()
-        self.email_node = EmailNode()
-        self.telegram_node = TelegramNode()
+    def __init__(self, report_generator: Optional[ReportGeneratorNode] = None,
+                 email_node: Optional[EmailNode] = None,
+                 telegram_node: Optional[TelegramNode] = None):
+        # Reuse the workflow engine's nodes when given, so there is one
+        # email sender thread and SMTP connection per process
+        self.report_generator = report_generator or ReportGeneratorNode()
+        self.email_node = email_node or EmailNode()
+        self.telegram_node = telegram_node or TelegramNode()
         
         # Task tracking
         self.last_weekly_report = None
@@ -54,12 +58,13 @@ class TaskScheduler:
                 return
             
             # Send via email
-            email_sent = self.email_node.send_weekly_report(report_data)
+            # The email is delivered in the background; this only says it was queued
+            email_queued = self.email_node.send_weekly_report(report_data)
             
             # Send summary via Telegram
             telegram_sent = self._send_weekly_telegram_summary(report_data)
             
-            if email_sent or telegram_sent:
+            if email_queued or telegram_sent:
                 self.last_weekly_report = datetime.now()
                 logger.info("Weekly report sent successfully")
             else:
@@ -93,12 +98,13 @@ class TaskScheduler:
                 return
             
             # Send via email
-            email_sent = self.email_node.send_monthly_report(report_data)
+            # The email is delivered in the background; this only says it was queued
+            email_queued = self.email_node.send_monthly_report(report_data)
             
             # Send summary via Telegram
             telegram_sent = self._send_monthly_telegram_summary(report_data)
             
-            if email_sent or telegram_sent:
+            if email_queued or telegram_sent:
                 self.last_monthly_report = datetime.now()
                 logger.info("Monthly report sent successfully")
             else:
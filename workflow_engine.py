@@ -4,8 +4,9 @@ Workflow Engine - Orchestrates the trading workflow like n8n
 
 import logging
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 from nodes.alpaca_node import AlpacaNode
 from nodes.technical_analysis_node import TechnicalAnalysisNode
@@ -14,16 +15,19 @@ from nodes.email_node import EmailNode
 from nodes.price_data_node import PriceDataNode
 from nodes.report_generator_node import ReportGeneratorNode
 from nodes.stock_selector_node import StockSelectorNode
-from config import Config
+from config import Config, get_config
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Upper bound on symbols processed in parallel during a trading cycle
+MAX_SYMBOL_WORKERS = 8
+
 class WorkflowEngine:
     """Main workflow engine that orchestrates trading operations"""
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.is_trading = False
         self.last_trading_cycle = None
         
@@ -88,11 +92,35 @@ class WorkflowEngine:
                 self._update_selected_stocks()
             
             # Use dynamically-selected stocks instead of fixed list
-            symbols = self.selected_stocks if self.selected_stocks else self.config.TRADING_CONFIG['symbols_to_trade']
+            symbols = self.selected_stocks if self.selected_stocks else self.config.TRADING.symbols_to_trade
             logger.info(f"Trading cycle processing {len(symbols)} symbols: {symbols}")
             
-            for symbol in symbols:
-                self._process_symbol(symbol)
+            # Fetch positions and quotes for the whole cycle up front
+            positions = {p['symbol']: p for p in self.alpaca_node.get_all_positions()}
+            prices = self.alpaca_node._get_prices_bulk(symbols)
+            
+            # Symbols are independent and I/O bound, so fetch and trade them concurrently
+            with ThreadPoolExecutor(max_workers=min(MAX_SYMBOL_WORKERS, len(symbols)) or 1) as executor:
+                # Step 1: Get price data (Price Data Node)
+                symbol_data = {}
+                for symbol, price_data in zip(symbols, executor.map(self.price_data_node.get_price_data, symbols)):
+                    if price_data:
+                        symbol_data[symbol] = (price_data, positions.get(symbol))
+                    else:
+                        logger.warning(f"No price data available for {symbol}")
+                
+                # Step 2: Analyze every symbol at once (Technical Analysis Node)
+                decisions = self.technical_analysis_node.decide_batch(symbol_data)
+                
+                # Step 3: Execute trades and notify per symbol
+                actionable = [symbol for symbol, decision in decisions.items() if decision['action'] in ['BUY', 'SELL']]
+                list(executor.map(
+                    self._act_on_decision,
+                    actionable,
+                    [decisions[symbol] for symbol in actionable],
+                    [symbol_data[symbol][0] for symbol in actionable],
+                    [prices.get(symbol) for symbol in actionable]
+                ))
             
             self.last_trading_cycle = datetime.now()
             logger.info("Trading cycle completed")
@@ -101,42 +129,25 @@ class WorkflowEngine:
             logger.error(f"Trading cycle error: {str(e)}")
             self.telegram_node.send_message(f"⚠️ Trading cycle error: {str(e)}")
     
-    def _process_symbol(self, symbol: str):
-        """Process a single symbol through the trading workflow"""
+    def _act_on_decision(self, symbol: str, trading_decision: Dict, price_data: Dict,
+                         quote_price: Optional[float] = None):
+        """Execute a BUY/SELL decision for one symbol and notify on success"""
         try:
-            logger.info(f"Processing symbol: {symbol}")
-            
-            # Step 1: Get price data (Price Data Node)
-            price_data = self.price_data_node.get_price_data(symbol)
-            if not price_data:
-                logger.warning(f"No price data available for {symbol}")
-                return
+            logger.info(f"Technical analysis decision for {symbol}: {trading_decision['action']} (confidence: {trading_decision['confidence']})")
             
-            # Step 2: Get current position (Alpaca Node)
-            current_position = self.alpaca_node.get_position(symbol)
+            # Execute trade (Alpaca Node)
+            trade_result = self._execute_trade(symbol, trading_decision, price_data, quote_price)
             
-            # Step 3: Analyze with Technical Analysis (Technical Analysis Node)
-            trading_decision = self.technical_analysis_node.get_trading_decision(
-                symbol, price_data, current_position
-            )
-            
-            if not trading_decision:
-                logger.warning(f"No trading decision received for {symbol}")
-                return
-            
-            # Step 4: Execute trade if needed (Alpaca Node)
-            if trading_decision['action'] in ['BUY', 'SELL']:
-                trade_result = self._execute_trade(symbol, trading_decision, price_data)
-                
-                if trade_result:
-                    # Step 5: Send notification (Telegram Node)
-                    self._send_trade_notification(symbol, trading_decision, trade_result)
+            if trade_result:
+                # Send notification (Telegram Node)
+                self._send_trade_notification(symbol, trading_decision, trade_result)
             
         except Exception as e:
             logger.error(f"Error processing {symbol}: {str(e)}")
             self.telegram_node.send_message(f"⚠️ Error processing {symbol}: {str(e)}")
     
-    def _execute_trade(self, symbol: str, decision: Dict, price_data: Dict) -> Dict:
+    def _execute_trade(self, symbol: str, decision: Dict, price_data: Dict,
+                       quote_price: Optional[float] = None) -> Dict:
         """Execute the trading decision"""
         try:
             action = decision['action']
@@ -148,7 +159,7 @@ class WorkflowEngine:
                 quantity = max(1, quantity // 2)  # Reduce quantity for low confidence
             
             # Check position limits
-            max_position = self.config.TRADING_CONFIG['max_position_size']
+            max_position = self.config.TRADING.max_position_size
             current_value = price_data['current_price'] * quantity
             
             if current_value > max_position:
@@ -160,7 +171,7 @@ class WorkflowEngine:
             
             # Execute the trade
             if action == 'BUY':
-                result = self.alpaca_node.place_buy_order(symbol, quantity)
+                result = self.alpaca_node.place_buy_order(symbol, quantity, price=quote_price)
             elif action == 'SELL':
                 result = self.alpaca_node.place_sell_order(symbol, quantity)
             else:
@@ -263,7 +274,7 @@ Reasoning: {reasoning[:200]}...
             logger.info("Updating stock selection using technical analysis...")
             
             # Get technically-selected stocks
-            max_stocks = self.config.TRADING_CONFIG.get('max_stocks_to_trade', 5)
+            max_stocks = self.config.TRADING.max_stocks_to_trade
             selected_stocks = self.stock_selector_node.select_trading_candidates(max_stocks)
             
             if selected_stocks:
@@ -284,7 +295,7 @@ Reasoning: {reasoning[:200]}...
             logger.error(f"Stock selection update error: {str(e)}")
             # Keep previous selection or use default
             if not self.selected_stocks:
-                self.selected_stocks = self.config.TRADING_CONFIG['symbols_to_trade']
+                self.selected_stocks = list(self.config.TRADING.symbols_to_trade)
     
     def _send_stock_selection_notification(self, stocks: List[str], market_analysis: Dict):
         """Send notification about new stock selection"""
@@ -354,25 +365,9 @@ Selected stocks for trading:
             }
     
     def _is_market_hours(self) -> bool:
-        """Check if current time is within trading hours (Eastern Time)"""
-        from datetime import timedelta
-        
-        # Get current UTC time and convert to Eastern Time
-        now_utc = datetime.utcnow()
-        # EST is UTC-5, EDT is UTC-4. For simplicity, use UTC-5 (EST)
-        est_offset = timedelta(hours=-5)
-        now_et = now_utc + est_offset
-        
-        # Skip weekends
-        if now_et.weekday() >= 5:  # Saturday = 5, Sunday = 6
-            return False
-        
-        # Check trading hours (9:30 AM - 4:00 PM ET)
-        current_time = now_et.time()
-        market_open = datetime.strptime("09:30", "%H:%M").time()
-        market_close = datetime.strptime("16:00", "%H:%M").time()
-        
-        return market_open <= current_time < market_close
+        """Check if the market is open within the configured trading hours (Eastern Time)"""
+        # The Alpaca node gates on the configured window and caches the market clock
+        return self.alpaca_node.is_market_open()
     
     def get_status(self) -> Dict:
         """Get current trading status"""
@@ -381,9 +376,19 @@ Selected stocks for trading:
             'last_cycle': self.last_trading_cycle.isoformat() if self.last_trading_cycle else None,
             'market_hours': self._is_market_hours(),
             'positions_count': len(self.positions),
-            'trades_today': len([t for t in self.trading_history if t['timestamp'].date() == datetime.now().date()])
+            'trades_today': self._count_trades_today()
         }
     
+    def _count_trades_today(self) -> int:
+        """Count today's trades, scanning back from the newest and stopping at the first older one"""
+        today = datetime.now().date()
+        count = 0
+        for trade in reversed(self.trading_history):
+            if trade['timestamp'].date() != today:
+                break
+            count += 1
+        return count
+    
     def get_recent_trades(self, limit: int = 10) -> List[Dict]:
         """Get recent trading history"""
         return sorted(self.trading_history, key=lambda x: x['timestamp'], reverse=True)[:limit]
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for running the trading bot under gunicorn
+"""
+
+from main import app, start_background_tasks, logger
+
+logger.info("Starting AI Trading Bot (WSGI)...")
+
+# The scheduler lives in the worker process alongside the workflow engine
+start_background_tasks()